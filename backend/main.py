@@ -17,7 +17,7 @@ from src.config import *
 from src.core.models import ActionPlan, PurchaseOrder, TransferOrder, ProjectHold
 from src.core.data_factory import DataFactory
 from src.core.bom_calculator import BOMCalculator
-from src.intelligence.weather_service import WeatherService
+from src.intelligence.weather_service import get_weather_service
 from src.intelligence.sentinel_agent import SentinelAgent
 from src.forecasting.demand_engine import DemandEngine
 from src.solver.inventory_reconciler import InventoryReconciler
@@ -90,7 +90,7 @@ class NexusOrchestrator:
         self.bom_calculator = BOMCalculator()
         
         # Intelligence layer
-        self.weather_service = WeatherService()
+        self.weather_service = get_weather_service()
         self.sentinel_agent = SentinelAgent()
         
         # Forecasting engine
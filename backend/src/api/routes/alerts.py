@@ -24,9 +24,9 @@ from src.api.database import get_db
 from src.api import db_models
 from src.core.triggers_engine import TriggersEngine, Severity
 from src.services.notification_service import (
-    NotificationService, 
     NotificationChannel,
-    NotificationResult
+    NotificationResult,
+    get_notification_service
 )
 from src.services.osrm_service import OSRMService
 from src.services.pdf_service import PDFService, ReportContent, get_pdf_service
@@ -173,7 +173,7 @@ def send_alert_notification(
     """
     
     # Initialize services
-    notification_service = NotificationService()
+    notification_service = get_notification_service()
     triggers_engine = TriggersEngine(db)
     llm_service = get_llm_service()
     pdf_service = get_pdf_service()
@@ -484,7 +484,7 @@ def send_bulk_notifications(
     Useful for notifying entire team about critical shortages.
     """
     
-    notification_service = NotificationService()
+    notification_service = get_notification_service()
     results = []
     
     for recipient in request.recipients:
@@ -574,7 +574,7 @@ def get_notification_settings():
     Shows which channels are properly configured.
     """
     # Use the notification service to get configuration status
-    notification_service = NotificationService()
+    notification_service = get_notification_service()
     config = notification_service.get_configuration_status()
     
     whatsapp_configured = config["whatsapp"]["configured"]
@@ -612,7 +612,7 @@ def test_notification_channel(
     Send a test message to verify channel configuration.
     """
     
-    notification_service = NotificationService()
+    notification_service = get_notification_service()
     
     test_message = f"""
 🧪 NEXUS Test Notification
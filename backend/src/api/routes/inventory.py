@@ -26,7 +26,7 @@ from src.core.triggers_engine import (
 )
 from src.utils.logger import setup_logger
 from src.services.llm_service import LLMService, AlertContext, AlertType, get_llm_service
-from src.services.notification_service import NotificationService
+from src.services.notification_service import get_notification_service
 from src.services.pdf_service import PDFService, ReportContent, get_pdf_service
 
 # IST timezone helper
@@ -1705,11 +1705,11 @@ def calculate_delivery_eta_endpoint(
     - `OSRM_URL`: Custom OSRM server URL (default: public OSRM)
     - `OSRM_API_KEY`: API key for private OSRM servers
     """
-    from src.services.osrm_service import OSRMService
+    from src.services.osrm_service import get_osrm_service
     
     if use_osrm:
-        # Use OSRM for real road-based routing
-        osrm = OSRMService()
+        # Use OSRM for real road-based routing (shared service: pooled session and route caches)
+        osrm = get_osrm_service()
         result = osrm.get_route(from_lat, from_lon, to_lat, to_lon, transport_mode)
         
         return {
@@ -2188,7 +2188,7 @@ def update_inventory_with_alert(
                 logger.error(f"PDF generation failed: {str(e)}")
         
         # Initialize notification service
-        notification_service = NotificationService()
+        notification_service = get_notification_service()
         
         # Send Email if threshold exceeded
         if should_alert_email:
@@ -12,9 +12,15 @@ Or:
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from dotenv import load_dotenv
 import uvicorn
 
+# Load .env once, before modules that read configuration at import time.
+# Variables already set in the environment take precedence.
+load_dotenv()
+
 from .database import engine, Base, init_db
+from ..services.llm_service import close_llm_service
 from .routes import (
     locations,
     projects,
@@ -43,7 +49,8 @@ async def lifespan(app: FastAPI):
     # Startup: Create database tables
     init_db()
     yield
-    # Shutdown logic (if needed)
+    # Shutdown: release pooled outbound connections
+    await close_llm_service()
     print("🔴 NEXUS API shutting down...")
 
 
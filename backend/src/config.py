@@ -70,6 +70,47 @@ MAJOR_CITIES = {
     "Patna": (25.5941, 85.1376)
 }
 
+# Coarse region extents: (min_lat, max_lat, min_lon, max_lon) boxes per region.
+# The boxes are disjoint, so a point's region does not depend on lookup order:
+# the Western/Southern overlap is split at lat 14.9 (Goa stays Western) and
+# Eastern/North-Eastern at lon 89.8 (the West Bengal/Assam border)
+REGION_BOUNDS = {
+    "Northern": ((28, 35, 72, 80),),
+    "Western": ((14.9, 25, 68, 77),),
+    "Eastern": ((20, 27, 83, 89.8),),
+    "Southern": ((8, 14.9, 72, 82), (14.9, 20, 77, 82)),
+    "North-Eastern": ((23, 29, 89.8, 97),)
+}
+DEFAULT_REGION = "Northern"
+
+# Reference coordinates (state capitals) for per-state weather readings
+STATE_COORDINATES = {
+    "Delhi": (28.6139, 77.2090),
+    "Punjab": (30.7333, 76.7794),
+    "Haryana": (30.7333, 76.7794),
+    "Himachal Pradesh": (31.1048, 77.1734),
+    "Uttarakhand": (30.3165, 78.0322),
+    "Jammu & Kashmir": (34.0837, 74.7973),
+    "Maharashtra": (19.0760, 72.8777),
+    "Gujarat": (23.2156, 72.6369),
+    "Rajasthan": (26.9124, 75.7873),
+    "Goa": (15.4909, 73.8278),
+    "West Bengal": (22.5726, 88.3639),
+    "Odisha": (20.2961, 85.8245),
+    "Bihar": (25.5941, 85.1376),
+    "Jharkhand": (23.3441, 85.3096),
+    "Karnataka": (12.9716, 77.5946),
+    "Tamil Nadu": (13.0827, 80.2707),
+    "Kerala": (8.5241, 76.9366),
+    "Andhra Pradesh": (16.5062, 80.6480),
+    "Telangana": (17.3850, 78.4867),
+    "Assam": (26.1445, 91.7362),
+    "Meghalaya": (25.5788, 91.8933),
+    "Manipur": (24.8170, 93.9368),
+    "Nagaland": (25.6751, 94.1086),
+    "Tripura": (23.8315, 91.2868)
+}
+
 # ============================================================================
 # TAX RATES (GST)
 # ============================================================================
@@ -160,6 +201,10 @@ WEATHER_IMPACT = {
     "Cold": {"construction_delay": 0.15, "spares_multiplier": 1.15}
 }
 
+# Forecast cache: nearby points share a geohash cell (precision 5 ~ 5km)
+WEATHER_CACHE_GEOHASH_PRECISION = 5
+WEATHER_CACHE_MAX_ENTRIES = 10000
+
 # ============================================================================
 # MARKET SENTIMENT PARAMETERS
 # ============================================================================
@@ -336,9 +336,9 @@ class MarketSentiment:
     halt_projects: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WeatherForecast:
-    """Weather forecast data"""
+    """Weather forecast data (immutable, slotted - cached in bulk by WeatherService)"""
     date: datetime
     region: str
     state: str
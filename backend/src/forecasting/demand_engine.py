@@ -13,7 +13,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from src.config import *
 from src.core.models import Project, Material, DemandForecast, ProjectStatus
 from src.core.bom_calculator import BOMCalculator
-from src.intelligence.weather_service import WeatherService
+from src.intelligence.weather_service import WeatherService, get_weather_service
 from src.intelligence.sentinel_agent import SentinelAgent
 
 try:
@@ -46,7 +46,7 @@ class DemandEngine:
         """
         self.projects = projects or []
         self.bom_calculator = bom_calculator or BOMCalculator()
-        self.weather_service = weather_service or WeatherService()
+        self.weather_service = weather_service or get_weather_service()
         self.sentinel_agent = sentinel_agent or SentinelAgent()
         
         # Initialize Prophet forecaster for OpEx demand
@@ -89,6 +89,9 @@ class DemandEngine:
         
         forecasts = []
         
+        # Resolve all project regions in one bulk lookup
+        self.weather_service.classify_projects(self.projects)
+        
         for project in self.projects:
             if not project.is_active():
                 continue
@@ -159,6 +162,9 @@ class DemandEngine:
         total_demand = {}
         projects_included = []
         
+        # Resolve all project regions in one bulk lookup
+        self.weather_service.classify_projects(projects)
+        
         for project in projects:
             # Apply filters
             if region and project.region != region:
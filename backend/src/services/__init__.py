@@ -4,17 +4,19 @@ NEXUS Services Module
 External API integrations and notification services.
 """
 
-from .osrm_service import OSRMService, get_eta_osrm
-from .notification_service import NotificationService, send_whatsapp, send_email
+from .osrm_service import OSRMService, get_eta_osrm, get_osrm_service
+from .notification_service import NotificationService, send_whatsapp, send_email, get_notification_service
 from .llm_service import LLMService, AlertContext, AlertType, LLMGeneratedAlert, get_llm_service
-from .pdf_service import PDFService, ReportContent, get_pdf_service
+from .pdf_service import PDFService, ReportContent, ReportSeverity, get_pdf_service
 
 __all__ = [
     "OSRMService",
     "get_eta_osrm",
+    "get_osrm_service",
     "NotificationService", 
     "send_whatsapp",
     "send_email",
+    "get_notification_service",
     "LLMService",
     "AlertContext",
     "AlertType",
@@ -22,5 +24,6 @@ __all__ = [
     "get_llm_service",
     "PDFService",
     "ReportContent",
+    "ReportSeverity",
     "get_pdf_service"
 ]
@@ -9,23 +9,157 @@ Uses Groq's fast inference for generating:
 - Contextual recommendations based on inventory status
 
 Environment Variables Required:
-- GROQ_API_KEY: Groq API key for LLM access
+- GROQ_API_KEY: Groq API key for LLM access (.env is loaded by the app entry point)
 """
 
 import os
 import json
+import time
+import random
+import asyncio
+import hashlib
 import logging
+import threading
+import unicodedata
 import httpx
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator, Iterable
+from dataclasses import dataclass, field
 from enum import Enum
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv(override=True)
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying: rate limiting and transient upstream failures
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_TRANSIENT_ERRORS = (httpx.TransportError,) + (
+    (aiohttp.ClientError, asyncio.TimeoutError) if AIOHTTP_AVAILABLE else ()
+)
+
+
+class _AsyncRateLimiter:
+    """Token bucket allowing max_rate acquisitions per time_period seconds"""
+    
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self._refill_per_second = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None  # Waiters are served in FIFO order
+        self._lock_loop = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """The lock for the running event loop (asyncio locks are bound to one loop)"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._lock_loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+    
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.max_rate),
+                    self._tokens + (now - self._updated) * self._refill_per_second
+                )
+                self._updated = now
+                
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                
+                await asyncio.sleep((1.0 - self._tokens) / self._refill_per_second)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data) -> Any:
+    """Parse a JSON str/bytes body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Top-level keys of the alert JSON object, in the order the model emits them
+_ALERT_FIELDS = (
+    "subject", "message", "whatsapp_message",
+    "recommended_actions", "urgency_level", "summary"
+)
+
+_PARTIAL_DECODER = json.JSONDecoder()
+
+
+def _canonicalize(text: str) -> str:
+    """
+    Normalize prompt text so equivalent prompts are byte-identical.
+    
+    Applies NFKC Unicode normalization, strips trailing whitespace from each
+    line and trims the whole string. Keeps provider prefix caching and the
+    response cache key stable.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return "\n".join(line.rstrip() for line in text.splitlines()).strip()
+
+
+def _parse_partial_json_fields(buffer: str, fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Extract top-level fields whose values are complete in a partial JSON object.
+    
+    Args:
+        buffer: JSON text received so far
+        fields: Keys to look for
+        
+    Returns:
+        Dict of the fields whose values could be fully decoded
+    """
+    found = {}
+    for field in fields:
+        key_pos = buffer.find(f'"{field}"')
+        if key_pos < 0:
+            continue
+        
+        colon = buffer.find(":", key_pos + len(field) + 2)
+        if colon < 0:
+            continue
+        
+        value_start = colon + 1
+        while value_start < len(buffer) and buffer[value_start].isspace():
+            value_start += 1
+        
+        try:
+            found[field], _ = _PARTIAL_DECODER.raw_decode(buffer, value_start)
+        except json.JSONDecodeError:
+            continue  # Value still streaming
+    
+    return found
+
 
 class AlertType(Enum):
     """Types of inventory alerts"""
@@ -36,7 +170,113 @@ class AlertType(Enum):
     OK = "ok"
 
 
-@dataclass
+_ALERT_TYPE_DESC = {
+    AlertType.UNDERSTOCK: "UNDERSTOCKING ALERT - Stock below reorder point",
+    AlertType.OVERSTOCK: "OVERSTOCKING ALERT - Stock exceeds maximum level",
+    AlertType.CRITICAL: "CRITICAL ALERT - Immediate action required",
+    AlertType.REORDER: "REORDER ALERT - Time to replenish stock",
+    AlertType.OK: "STATUS OK - Stock levels normal"
+}
+
+_SEVERITY_EMOJI = {"RED": "🔴", "AMBER": "🟡", "GREEN": "🟢"}
+
+# Fallback message templates, formatted with the AlertContext as `c`
+_SUBJECT_TEMPLATE = "{emoji} NEXUS Alert: {alert_type} - {c.material_name} at {c.warehouse_code}"
+
+# alert type -> (situation, risk, action); other types use _DEFAULT_MESSAGE_PARTS
+_MESSAGE_PARTS = {
+    AlertType.UNDERSTOCK: (
+        "Stock levels for {c.material_name} have fallen below the reorder point.",
+        "Current stock of {c.current_stock:.0f} units provides only {c.days_of_stock:.1f} days of coverage, while lead time is {c.lead_time_days} days.",
+        "Immediate procurement action is recommended to avoid stockout."
+    ),
+    AlertType.OVERSTOCK: (
+        "Stock levels for {c.material_name} exceed the maximum recommended level.",
+        "Current stock of {c.current_stock:.0f} units is {overstock_pct:.1f}% above maximum, tying up capital and warehouse space.",
+        "Consider redistributing excess stock to other warehouses or accelerating project utilization."
+    )
+}
+_DEFAULT_MESSAGE_PARTS = (
+    "Inventory status update for {c.material_name}.",
+    "Current stock: {c.current_stock:.0f} units with {c.days_of_stock:.1f} days of coverage.",
+    "Continue monitoring stock levels."
+)
+
+_MESSAGE_TEMPLATE = """NEXUS Inventory Alert
+
+{situation}
+
+Location: {c.warehouse_name} ({c.warehouse_code})
+Material: {c.material_name} ({c.material_code})
+Location: {c.location}
+
+Stock Status:
+- Current Stock: {c.current_stock:.0f} units
+- Reorder Point: {c.reorder_point:.0f} units  
+- Days of Stock: {c.days_of_stock:.1f} days
+- UTR (Understock Ratio): {c.utr:.1%}
+- OTR (Overstock Ratio): {c.otr:.1%}
+
+{risk}
+
+Recommended Action:
+{action}
+
+---
+This is an automated alert from NEXUS Inventory Management System.
+POWERGRID Corporation of India Limited"""
+
+_WHATSAPP_TEMPLATE = """{emoji} NEXUS {alert_type}
+Material: {c.material_name}
+Location: {c.warehouse_code}
+Stock: {c.current_stock:.0f} units
+Days left: {c.days_of_stock:.1f}
+UTR: {c.utr:.1%} | OTR: {c.otr:.1%}"""
+
+_OVERSTOCK_ACTIONS = (
+    "Identify warehouses with low stock for transfer",
+    "Review upcoming project pipeline for utilization",
+    "Consider postponing incoming orders",
+    "Evaluate storage optimization options"
+)
+_MONITOR_ACTIONS = (
+    "Continue regular monitoring",
+    "Review demand forecasts",
+    "Maintain safety stock levels"
+)
+
+_SUMMARY_TEMPLATES = {
+    AlertType.UNDERSTOCK: "{c.material_code} at {c.warehouse_code}: {c.days_of_stock:.0f} days of stock remaining",
+    AlertType.OVERSTOCK: "{c.material_code} at {c.warehouse_code}: {c.otr:.0%} overstocked"
+}
+_DEFAULT_SUMMARY_TEMPLATE = "{c.material_code} at {c.warehouse_code}: Stock level update"
+
+_REPORT_TEMPLATE = """Inventory Report: {material_name}
+
+Current Status: Stock is currently {status}.
+- Current Stock: {current_stock:.0f} units
+- Optimal Level: {optimal_stock:.0f} units
+- Gap: {gap:.0f} units {gap_label}
+
+Key Metrics:
+- Understock Ratio (UTR): {utr:.1%}
+- Overstock Ratio (OTR): {otr:.1%}
+- Days of Stock: {days_of_stock:.1f}
+
+Recommendation: {recommendation}"""
+
+# One line of the report prompt's recent-history block
+_HIST_FMT = "- {date}: {action} - {qty} units".format
+
+# sign of (optimal - current) -> (status, gap label, recommendation)
+_REPORT_STATUS = {
+    1: ("understocked", "needed", "Initiate procurement to restore optimal levels."),
+    -1: ("overstocked", "excess", "Consider redistribution to balance inventory."),
+    0: ("optimal", "", "Maintain current stock management practices.")
+}
+
+
+@dataclass(slots=True, frozen=True)
 class AlertContext:
     """Context for generating alert messages"""
     material_name: str
@@ -57,6 +297,40 @@ class AlertContext:
     alert_type: AlertType
     severity: str  # RED, AMBER, GREEN
     
+    # Fallback content, derived once in __post_init__
+    _actions: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _urgency: str = field(init=False, repr=False, compare=False)
+    _summary: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.alert_type == AlertType.UNDERSTOCK or self.utr > 0.3:
+            actions = (
+                f"Initiate purchase order for {self.reorder_point - self.current_stock:.0f} units",
+                "Check with nearby warehouses for emergency transfer",
+                "Review upcoming project requirements",
+                "Contact approved vendors for fastest delivery"
+            )
+        elif self.alert_type == AlertType.OVERSTOCK or self.otr > 0.3:
+            actions = _OVERSTOCK_ACTIONS
+        else:
+            actions = _MONITOR_ACTIONS
+        
+        if self.severity == "RED" or self.utr > 0.7:
+            urgency = "IMMEDIATE"
+        elif self.severity == "AMBER" or self.utr > 0.5:
+            urgency = "HIGH"
+        elif self.utr > 0.2 or self.otr > 0.2:
+            urgency = "MEDIUM"
+        else:
+            urgency = "LOW"
+        
+        summary = _SUMMARY_TEMPLATES.get(self.alert_type, _DEFAULT_SUMMARY_TEMPLATE).format(c=self)
+        
+        # Frozen dataclass: bypass __setattr__ for the derived fields
+        object.__setattr__(self, "_actions", actions)
+        object.__setattr__(self, "_urgency", urgency)
+        object.__setattr__(self, "_summary", summary)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "material": {
@@ -91,22 +365,30 @@ class AlertContext:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LLMGeneratedAlert:
     """Generated alert message from LLM"""
     subject: str
     message: str
     whatsapp_message: str
-    recommended_actions: list
+    recommended_actions: Tuple[str, ...]
     urgency_level: str
     summary: str
     
+    def __post_init__(self):
+        # Instances are shared via the response cache, so the actions must not be mutable
+        actions = self.recommended_actions
+        if not isinstance(actions, tuple):
+            # Model output may hold null or a single string instead of a list
+            actions = (actions,) if isinstance(actions, str) else tuple(actions or ())
+            object.__setattr__(self, "recommended_actions", actions)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "subject": self.subject,
             "message": self.message,
             "whatsapp_message": self.whatsapp_message,
-            "recommended_actions": self.recommended_actions,
+            "recommended_actions": list(self.recommended_actions),
             "urgency_level": self.urgency_level,
             "summary": self.summary
         }
@@ -133,22 +415,39 @@ class LLMService:
     # Groq API configuration
     GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
     DEFAULT_MODEL = "llama-3.3-70b-versatile"  # Fast and capable model
+    FAST_MODEL = "llama-3.1-8b-instant"  # Lower latency, used for non-critical alerts
     
-    def __init__(self, api_key: str = None, model: str = None):
-        """
-        Initialize LLM service with Groq API credentials.
-        
-        Falls back to environment variable if not provided.
-        """
-        self.api_key = api_key or os.getenv("GROQ_API_KEY")
-        self.model = model or self.DEFAULT_MODEL
-        
-        if not self.api_key:
-            logger.warning("GROQ_API_KEY not found - LLM service will use fallback messages")
+    # Output budgets: the alert JSON fits in ~350 tokens, reports in 2-3 paragraphs
+    ALERT_MAX_TOKENS = 400
+    REPORT_MAX_TOKENS = 500
+    REQUEST_TIMEOUT = 30.0
+    
+    # Keep-alive pool shared by all requests from this service
+    CONNECTION_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+    
+    # Client-side throttling to stay within the Groq rate-limit tier (free tier defaults)
+    REQUESTS_PER_MINUTE = 60
+    MAX_CONCURRENT_ASYNC_REQUESTS = 10
+    
+    MAX_SYNC_WORKERS = 16  # Threads for generate_alert_threaded
+    
+    # GREEN alerts with both ratios below this use the template instead of the LLM
+    LLM_SKIP_THRESHOLD = 0.2
+    
+    # Retries for 429/5xx and connection errors (exponential backoff with jitter)
+    RETRY_ATTEMPTS = 4
+    RETRY_INITIAL_WAIT = 0.5  # seconds
+    RETRY_MAX_WAIT = 8.0  # seconds
     
-    def _build_system_prompt(self) -> str:
-        """Build the system prompt for inventory alert generation"""
-        return """You are NEXUS, an AI-powered inventory management assistant for POWERGRID India, managing electrical grid infrastructure materials across warehouses and substations.
+    # Generated alerts are reused for identical prompts within the TTL
+    RESPONSE_CACHE_SIZE = 4096
+    RESPONSE_CACHE_TTL = 300.0  # seconds
+    
+    # System prompt is identical for every alert - built once at import.
+    # All static instructions (alert glossary, output schema) live here so every
+    # request shares one long prefix that the provider can cache; the user
+    # message carries only the per-alert values.
+    _SYSTEM_PROMPT = """You are NEXUS, an AI-powered inventory management assistant for POWERGRID India, managing electrical grid infrastructure materials across warehouses and substations.
 
 Your role is to generate clear, actionable, and professional alert messages for inventory status changes.
 
@@ -171,21 +470,149 @@ For OVERSTOCKING (high OTR):
 - Suggest redistribution to other warehouses
 - Consider project pipeline utilization
 
-Always respond with a valid JSON object."""
+Alert types you will receive:
+- UNDERSTOCKING ALERT - Stock below reorder point
+- OVERSTOCKING ALERT - Stock exceeds maximum level
+- CRITICAL ALERT - Immediate action required
+- REORDER ALERT - Time to replenish stock
+- STATUS OK - Stock levels normal
 
-    def _build_user_prompt(self, context: AlertContext) -> str:
-        """Build the user prompt with context"""
-        alert_type_desc = {
-            AlertType.UNDERSTOCK: "UNDERSTOCKING ALERT - Stock below reorder point",
-            AlertType.OVERSTOCK: "OVERSTOCKING ALERT - Stock exceeds maximum level",
-            AlertType.CRITICAL: "CRITICAL ALERT - Immediate action required",
-            AlertType.REORDER: "REORDER ALERT - Time to replenish stock",
-            AlertType.OK: "STATUS OK - Stock levels normal"
+Each request lists the alert type, severity, material, location, stock status,
+key ratios (UTR, OTR, PAR) and daily demand. The closing FLAGS line lists
+ratios that exceed 30% (HIGH).
+
+Always respond with a valid JSON object in this exact format:
+{
+    "subject": "Email subject line (max 80 chars)",
+    "message": "Full email message body (2-3 paragraphs, professional tone)",
+    "whatsapp_message": "Short WhatsApp message (max 280 chars with key info)",
+    "recommended_actions": ["Action 1", "Action 2", "Action 3"],
+    "urgency_level": "IMMEDIATE/HIGH/MEDIUM/LOW",
+    "summary": "One sentence summary (max 100 chars)"
+}"""
+    
+    def __init__(
+        self,
+        api_key: str = None,
+        model: str = None,
+        fast_model: str = None,
+        alert_max_tokens: int = None,
+        report_max_tokens: int = None,
+        rpm: int = None,
+        concurrency: int = None,
+        llm_skip_threshold: float = None
+    ):
+        """
+        Initialize LLM service with Groq API credentials.
+        
+        Falls back to environment variable if not provided.
+        
+        Args:
+            api_key: Groq API key
+            model: Model for RED alerts and reports
+            fast_model: Smaller model for AMBER/GREEN alerts
+            alert_max_tokens: Output token limit for alerts
+            report_max_tokens: Output token limit for reports
+            rpm: Maximum async requests per minute (0 disables the limit)
+            concurrency: Maximum async requests in flight
+            llm_skip_threshold: UTR/OTR below which GREEN alerts skip the LLM
+        """
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        self.model = model or self.DEFAULT_MODEL
+        self.fast_model = fast_model or self.FAST_MODEL
+        self.alert_max_tokens = alert_max_tokens or self.ALERT_MAX_TOKENS
+        self.report_max_tokens = report_max_tokens or self.REPORT_MAX_TOKENS
+        self.rpm = self.REQUESTS_PER_MINUTE if rpm is None else rpm
+        self.concurrency = concurrency or self.MAX_CONCURRENT_ASYNC_REQUESTS
+        self.llm_skip_threshold = (
+            self.LLM_SKIP_THRESHOLD if llm_skip_threshold is None else llm_skip_threshold
+        )
+        
+        if not self.api_key:
+            logger.warning("GROQ_API_KEY not found - LLM service will use fallback messages")
+        
+        # Persistent clients reuse TCP/TLS connections to Groq across calls
+        self._client = httpx.Client(
+            timeout=self.REQUEST_TIMEOUT,
+            http2=HTTP2_AVAILABLE,
+            limits=self.CONNECTION_LIMITS,
+            headers=self._headers()
+        )
+        # Async clients and the semaphore belong to one event loop, see _bind_loop
+        self._async_loop = None
+        self._aclient: Optional[httpx.AsyncClient] = None  # Created on first async call
+        self._aio_session = None  # aiohttp.ClientSession, created on first async call
+        self._aio_semaphore: Optional[asyncio.Semaphore] = None
+        self._rpm_limiter = _AsyncRateLimiter(self.rpm) if self.rpm > 0 else None
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_SYNC_WORKERS, thread_name_prefix="llm")
+        
+        # Prompt hash -> (stored_at, alert); LRU ordered, guarded for threadpool callers
+        self._response_cache: "OrderedDict[str, Tuple[float, LLMGeneratedAlert]]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+    
+    def _headers(self) -> Dict[str, str]:
+        """Request headers for the Groq API"""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
         }
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the async client, creating it on first use inside the running event loop"""
+        if self._aclient is None or self._aclient.is_closed:
+            self._aclient = httpx.AsyncClient(
+                timeout=self.REQUEST_TIMEOUT,
+                http2=HTTP2_AVAILABLE,
+                limits=self.CONNECTION_LIMITS,
+                headers=self._headers()
+            )
+        return self._aclient
+    
+    def _get_aio_session(self) -> "aiohttp.ClientSession":
+        """Get the aiohttp session, creating it on first use inside the running event loop"""
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT),
+                headers=self._headers()
+            )
+        return self._aio_session
+    
+    def close(self):
+        """Close the pooled sync connections and the worker threads"""
+        self._executor.shutdown(wait=False)
+        self._client.close()
+    
+    async def aclose(self):
+        """Close all pooled clients (call from the app shutdown hook)"""
+        self.close()
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
+    
+    def __del__(self):
+        client = getattr(self, "_client", None)
+        if client is not None:
+            client.close()
+    
+    def _build_user_prompt(self, context: AlertContext) -> str:
+        """
+        Build the user prompt with context (per-alert values only).
         
-        return f"""Generate an inventory alert message for the following situation:
-
-ALERT TYPE: {alert_type_desc.get(context.alert_type, "INVENTORY ALERT")}
+        Lines keep a fixed layout regardless of values; value-dependent flags
+        go in the closing FLAGS line so the rest of the prompt stays stable.
+        """
+        flags = [
+            name for name, ratio in (("UTR", context.utr), ("OTR", context.otr))
+            if ratio > 0.3
+        ]
+        
+        return _canonicalize(f"""ALERT TYPE: {_ALERT_TYPE_DESC.get(context.alert_type, "INVENTORY ALERT")}
 SEVERITY: {context.severity}
 
 MATERIAL DETAILS:
@@ -205,22 +632,220 @@ STOCK STATUS:
 - Lead Time: {context.lead_time_days} days
 
 KEY RATIOS:
-- UTR (Understock Ratio): {context.utr:.2%} {"⚠️ HIGH" if context.utr > 0.3 else ""}
-- OTR (Overstock Ratio): {context.otr:.2%} {"⚠️ HIGH" if context.otr > 0.3 else ""}
+- UTR (Understock Ratio): {context.utr:.2%}
+- OTR (Overstock Ratio): {context.otr:.2%}
 - PAR (Procurement Adequacy): {context.par:.2%}
 
 Daily Demand: {context.daily_demand:.1f} units/day
 
-Generate a response in this exact JSON format:
-{{
-    "subject": "Email subject line (max 80 chars)",
-    "message": "Full email message body (2-3 paragraphs, professional tone)",
-    "whatsapp_message": "Short WhatsApp message (max 280 chars with key info)",
-    "recommended_actions": ["Action 1", "Action 2", "Action 3"],
-    "urgency_level": "IMMEDIATE/HIGH/MEDIUM/LOW",
-    "summary": "One sentence summary (max 100 chars)"
-}}"""
+FLAGS: {", ".join(f"{name} HIGH" for name in flags) if flags else "none"}""")
 
+    def _alert_payload(self, context: AlertContext) -> Dict[str, Any]:
+        """Build the chat completion request body for an alert"""
+        return {
+            # Reserve the large model for critical alerts
+            "model": self.model if context.severity == "RED" else self.fast_model,
+            "messages": [
+                {"role": "system", "content": self._SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_user_prompt(context)}
+            ],
+            "temperature": 0.7,
+            "max_tokens": self.alert_max_tokens,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _use_fallback(self, context: AlertContext) -> bool:
+        """
+        Whether to skip Groq and use the template alert.
+        
+        True without an API key, and for status-OK or low-ratio GREEN alerts,
+        whose generated text adds nothing over the template.
+        """
+        if not self.api_key or context.alert_type == AlertType.OK:
+            return True
+        return (
+            context.severity == "GREEN"
+            and context.utr < self.llm_skip_threshold
+            and context.otr < self.llm_skip_threshold
+        )
+    
+    def _cache_key(self, payload: Dict[str, Any]) -> str:
+        """
+        Hash the parts of a request that determine the response.
+        
+        The user prompt renders every value at display precision, so contexts
+        differing only below that precision share a key.
+        """
+        raw = f"{payload['model']}\x00{payload['messages'][-1]['content']}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[LLMGeneratedAlert]:
+        """Return a cached alert if present and not expired"""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, alert = entry
+            if time.monotonic() - stored_at > self.RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            
+            self._response_cache.move_to_end(key)
+            return alert
+    
+    def _cache_put(self, key: str, alert: LLMGeneratedAlert):
+        """Store an alert, evicting the least recently used entry when full"""
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic(), alert)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    def _alert_from_response(self, data: Dict[str, Any], context: AlertContext) -> LLMGeneratedAlert:
+        """Parse a chat completion response into an alert, filling gaps with defaults"""
+        content = data["choices"][0]["message"]["content"]
+        return self._alert_from_fields(_json_loads(content), context)
+    
+    def _alert_from_fields(self, parsed: Dict[str, Any], context: AlertContext) -> LLMGeneratedAlert:
+        """Build an alert from the parsed JSON fields, filling gaps with defaults"""
+        return LLMGeneratedAlert(
+            subject=parsed.get("subject", self._default_subject(context)),
+            message=parsed.get("message", self._default_message(context)),
+            whatsapp_message=parsed.get("whatsapp_message", self._default_whatsapp(context)),
+            recommended_actions=parsed.get("recommended_actions", []),
+            urgency_level=parsed.get("urgency_level", "MEDIUM"),
+            summary=parsed.get("summary", "Inventory alert generated")
+        )
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before the next attempt.
+        
+        Honors a numeric Retry-After header, otherwise backs off exponentially
+        with jitter. Both are capped at RETRY_MAX_WAIT.
+        """
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), self.RETRY_MAX_WAIT)
+            except ValueError:
+                pass  # HTTP-date form, fall back to backoff
+        
+        delay = self.RETRY_INITIAL_WAIT * (2 ** attempt) + random.uniform(0, self.RETRY_INITIAL_WAIT)
+        return min(delay, self.RETRY_MAX_WAIT)
+    
+    def _post_groq(self, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        POST a request to Groq, retrying rate-limited and transient failures.
+        
+        Returns:
+            The final response (which may still be an error status)
+        """
+        body = _json_dumps(payload)
+        
+        for attempt in range(self.RETRY_ATTEMPTS):
+            last_attempt = attempt == self.RETRY_ATTEMPTS - 1
+            try:
+                response = self._client.post(self.GROQ_API_URL, content=body)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                reason, retry_after = str(e) or type(e).__name__, None
+            else:
+                if response.status_code not in _RETRY_STATUSES or last_attempt:
+                    return response
+                reason, retry_after = response.status_code, response.headers.get("Retry-After")
+            
+            delay = self._retry_delay(attempt, retry_after)
+            logger.warning("Groq request failed (%s), retrying in %.1fs", reason, delay)
+            time.sleep(delay)
+    
+    async def _bind_loop(self):
+        """
+        Tie the async clients and semaphore to the running event loop.
+        
+        They cannot be used from another loop (e.g. a second asyncio.run on
+        the shared service), so they are rebuilt when the loop changes and
+        the previous loop's clients are closed best-effort.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is self._async_loop:
+            return
+        
+        self._async_loop = loop
+        self._aio_semaphore = asyncio.Semaphore(self.concurrency)
+        stale_client, stale_session = self._aclient, self._aio_session
+        self._aclient = self._aio_session = None
+        
+        try:
+            if stale_session is not None:
+                await stale_session.close()
+            if stale_client is not None:
+                await stale_client.aclose()
+        except Exception as e:
+            logger.debug("Closing async clients from a previous event loop failed: %s", e)
+    
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Wait for the per-minute budget, then hold a concurrency slot"""
+        await self._bind_loop()
+        if self._rpm_limiter is not None:
+            await self._rpm_limiter.acquire()
+        async with self._aio_semaphore:
+            yield
+    
+    async def _post_groq_once_async(self, body: bytes) -> Tuple[int, Any, Optional[str]]:
+        """
+        Send one POST to Groq from async code.
+        
+        Uses the shared aiohttp session when available (better throughput
+        under concurrency), otherwise the pooled httpx async client.
+        
+        Returns:
+            (status_code, parsed JSON body on 200 / response text otherwise, Retry-After header)
+        """
+        async with self._request_slot():
+            if AIOHTTP_AVAILABLE:
+                async with self._get_aio_session().post(self.GROQ_API_URL, data=body) as response:
+                    retry_after = response.headers.get("Retry-After")
+                    if response.status == 200:
+                        return response.status, _json_loads(await response.read()), retry_after
+                    return response.status, await response.text(), retry_after
+            
+            response = await self._get_async_client().post(self.GROQ_API_URL, content=body)
+            retry_after = response.headers.get("Retry-After")
+            if response.status_code == 200:
+                return response.status_code, _json_loads(response.content), retry_after
+            return response.status_code, response.text, retry_after
+    
+    async def _post_groq_async(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        POST a request to Groq from async code, retrying rate-limited and transient failures.
+        
+        The concurrency slot is released while backing off.
+        
+        Returns:
+            (status_code, parsed JSON body on 200 / response text otherwise)
+        """
+        body = _json_dumps(payload)
+        
+        for attempt in range(self.RETRY_ATTEMPTS):
+            last_attempt = attempt == self.RETRY_ATTEMPTS - 1
+            try:
+                status, result, retry_after = await self._post_groq_once_async(body)
+            except _TRANSIENT_ERRORS as e:
+                if last_attempt:
+                    raise
+                reason, retry_after = str(e) or type(e).__name__, None
+            else:
+                if status not in _RETRY_STATUSES or last_attempt:
+                    return status, result
+                reason = status
+            
+            delay = self._retry_delay(attempt, retry_after)
+            logger.warning("Groq request failed (%s), retrying in %.1fs", reason, delay)
+            await asyncio.sleep(delay)
+    
     async def generate_alert_async(self, context: AlertContext) -> LLMGeneratedAlert:
         """
         Generate alert message using Groq API (async version).
@@ -231,50 +856,171 @@ Generate a response in this exact JSON format:
         Returns:
             LLMGeneratedAlert with generated messages
         """
-        if not self.api_key:
+        if self._use_fallback(context):
             return self._fallback_alert(context)
         
+        payload = self._alert_payload(context)
+        cache_key = self._cache_key(payload)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.GROQ_API_URL,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": self._build_system_prompt()},
-                            {"role": "user", "content": self._build_user_prompt(context)}
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 1024,
-                        "response_format": {"type": "json_object"}
-                    }
-                )
+            status, body = await self._post_groq_async(payload)
+            
+            if status == 200:
+                alert = self._alert_from_response(body, context)
+                self._cache_put(cache_key, alert)
+                return alert
+            else:
+                logger.error("Groq API error: %s - %s", status, body)
+                return self._fallback_alert(context)
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data["choices"][0]["message"]["content"]
-                    parsed = json.loads(content)
-                    
-                    return LLMGeneratedAlert(
-                        subject=parsed.get("subject", self._default_subject(context)),
-                        message=parsed.get("message", self._default_message(context)),
-                        whatsapp_message=parsed.get("whatsapp_message", self._default_whatsapp(context)),
-                        recommended_actions=parsed.get("recommended_actions", []),
-                        urgency_level=parsed.get("urgency_level", "MEDIUM"),
-                        summary=parsed.get("summary", "Inventory alert generated")
-                    )
-                else:
-                    logger.error(f"Groq API error: {response.status_code} - {response.text}")
-                    return self._fallback_alert(context)
-                    
         except Exception as e:
-            logger.error(f"LLM generation failed: {str(e)}")
+            logger.error("LLM generation failed: %s", e)
             return self._fallback_alert(context)
     
+    async def generate_alerts_bulk_async(
+        self,
+        contexts: List[AlertContext],
+        concurrency: int = 20
+    ) -> List[LLMGeneratedAlert]:
+        """
+        Generate alerts for many contexts concurrently.
+        
+        Args:
+            contexts: AlertContexts to generate alerts for
+            concurrency: Maximum requests in flight for this batch
+            
+        Returns:
+            LLMGeneratedAlerts in the same order as contexts
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _one(context: AlertContext) -> LLMGeneratedAlert:
+            async with semaphore:
+                return await self.generate_alert_async(context)
+        
+        results = await asyncio.gather(*[_one(c) for c in contexts], return_exceptions=True)
+        
+        return [
+            self._fallback_alert(context) if isinstance(result, Exception) else result
+            for context, result in zip(contexts, results)
+        ]
+    
+    async def _stream_groq_lines_async(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        POST a streaming request to Groq and yield the raw Server-Sent Event lines.
+        
+        Raises:
+            RuntimeError: If Groq returns a non-200 status
+        """
+        body = _json_dumps(payload)
+        
+        async with self._request_slot():
+            if AIOHTTP_AVAILABLE:
+                async with self._get_aio_session().post(self.GROQ_API_URL, data=body) as response:
+                    if response.status != 200:
+                        raise RuntimeError(f"Groq API error: {response.status} - {await response.text()}")
+                    async for raw_line in response.content:
+                        yield raw_line.decode("utf-8")
+                return
+            
+            async with self._get_async_client().stream("POST", self.GROQ_API_URL, content=body) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise RuntimeError(f"Groq API error: {response.status_code} - {response.text}")
+                async for line in response.aiter_lines():
+                    yield line
+    
+    async def generate_alert_stream_async(self, context: AlertContext) -> AsyncIterator[LLMGeneratedAlert]:
+        """
+        Generate an alert with a streaming request, yielding partial snapshots.
+        
+        A snapshot is yielded each time another top-level field (subject,
+        summary, ...) has fully arrived, so a UI can render it before the
+        message body finishes. Fields not yet received are empty. The last
+        item yielded is always the complete alert (or the fallback alert).
+        
+        Args:
+            context: AlertContext with all inventory details
+            
+        Yields:
+            LLMGeneratedAlert snapshots, ending with the complete alert
+        """
+        if self._use_fallback(context):
+            yield self._fallback_alert(context)
+            return
+        
+        payload = self._alert_payload(context)
+        cache_key = self._cache_key(payload)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        # JSON mode is not available for streamed completions; the system prompt
+        # already asks for the JSON object
+        payload = {k: v for k, v in payload.items() if k != "response_format"}
+        payload["stream"] = True
+        
+        chunks: List[str] = []
+        fields: Dict[str, Any] = {}
+        
+        try:
+            async for line in self._stream_groq_lines_async(payload):
+                line = line.strip()
+                if not line.startswith("data:"):
+                    continue
+                
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                
+                delta = _json_loads(data)["choices"][0]["delta"].get("content")
+                if not delta:
+                    continue
+                chunks.append(delta)
+                
+                pending = [f for f in _ALERT_FIELDS if f not in fields]
+                completed = _parse_partial_json_fields("".join(chunks), pending)
+                if completed and len(fields) + len(completed) < len(_ALERT_FIELDS):
+                    fields.update(completed)
+                    yield LLMGeneratedAlert(
+                        subject=fields.get("subject", ""),
+                        message=fields.get("message", ""),
+                        whatsapp_message=fields.get("whatsapp_message", ""),
+                        recommended_actions=fields.get("recommended_actions", []),
+                        urgency_level=fields.get("urgency_level", ""),
+                        summary=fields.get("summary", "")
+                    )
+            
+            alert = self._alert_from_fields(_json_loads("".join(chunks)), context)
+            
+        except Exception as e:
+            logger.error("LLM streaming generation failed: %s", e)
+            yield self._fallback_alert(context)
+            return
+        
+        self._cache_put(cache_key, alert)
+        yield alert
+    
+    async def generate_alert_threaded(self, context: AlertContext) -> LLMGeneratedAlert:
+        """
+        Run the sync generate_alert on the service's thread pool.
+        
+        For async callers that need the sync code path without blocking the
+        event loop. Prefer generate_alert_async, which needs no threads.
+        
+        Args:
+            context: AlertContext with all inventory details
+            
+        Returns:
+            LLMGeneratedAlert with generated messages
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.generate_alert, context)
+    
     def generate_alert(self, context: AlertContext) -> LLMGeneratedAlert:
         """
         Generate alert message using Groq API (sync version).
@@ -285,50 +1031,29 @@ Generate a response in this exact JSON format:
         Returns:
             LLMGeneratedAlert with generated messages
         """
-        if not self.api_key:
+        if self._use_fallback(context):
             return self._fallback_alert(context)
         
+        payload = self._alert_payload(context)
+        cache_key = self._cache_key(payload)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    self.GROQ_API_URL,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": self._build_system_prompt()},
-                            {"role": "user", "content": self._build_user_prompt(context)}
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 1024,
-                        "response_format": {"type": "json_object"}
-                    }
-                )
+            response = self._post_groq(payload)
+            
+            if response.status_code == 200:
+                alert = self._alert_from_response(_json_loads(response.content), context)
+                self._cache_put(cache_key, alert)
+                logger.info("LLM alert generated successfully for %s", context.material_code)
+                return alert
+            else:
+                logger.error("Groq API error: %s - %s", response.status_code, response.text)
+                return self._fallback_alert(context)
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data["choices"][0]["message"]["content"]
-                    parsed = json.loads(content)
-                    
-                    logger.info(f"LLM alert generated successfully for {context.material_code}")
-                    
-                    return LLMGeneratedAlert(
-                        subject=parsed.get("subject", self._default_subject(context)),
-                        message=parsed.get("message", self._default_message(context)),
-                        whatsapp_message=parsed.get("whatsapp_message", self._default_whatsapp(context)),
-                        recommended_actions=parsed.get("recommended_actions", []),
-                        urgency_level=parsed.get("urgency_level", "MEDIUM"),
-                        summary=parsed.get("summary", "Inventory alert generated")
-                    )
-                else:
-                    logger.error(f"Groq API error: {response.status_code} - {response.text}")
-                    return self._fallback_alert(context)
-                    
         except Exception as e:
-            logger.error(f"LLM generation failed: {str(e)}")
+            logger.error("LLM generation failed: %s", e)
             return self._fallback_alert(context)
     
     def _fallback_alert(self, context: AlertContext) -> LLMGeneratedAlert:
@@ -344,103 +1069,46 @@ Generate a response in this exact JSON format:
     
     def _default_subject(self, context: AlertContext) -> str:
         """Generate default email subject"""
-        severity_emoji = {"RED": "🔴", "AMBER": "🟡", "GREEN": "🟢"}.get(context.severity, "")
-        alert_type = context.alert_type.value.upper()
-        return f"{severity_emoji} NEXUS Alert: {alert_type} - {context.material_name} at {context.warehouse_code}"
+        return _SUBJECT_TEMPLATE.format(
+            emoji=_SEVERITY_EMOJI.get(context.severity, ""),
+            alert_type=context.alert_type.value.upper(),
+            c=context
+        )
     
     def _default_message(self, context: AlertContext) -> str:
         """Generate default email message"""
-        if context.alert_type == AlertType.UNDERSTOCK:
-            situation = f"Stock levels for {context.material_name} have fallen below the reorder point."
-            risk = f"Current stock of {context.current_stock:.0f} units provides only {context.days_of_stock:.1f} days of coverage, while lead time is {context.lead_time_days} days."
-            action = "Immediate procurement action is recommended to avoid stockout."
-        elif context.alert_type == AlertType.OVERSTOCK:
-            situation = f"Stock levels for {context.material_name} exceed the maximum recommended level."
-            risk = f"Current stock of {context.current_stock:.0f} units is {((context.current_stock / context.max_stock_level) - 1) * 100:.1f}% above maximum, tying up capital and warehouse space."
-            action = "Consider redistributing excess stock to other warehouses or accelerating project utilization."
-        else:
-            situation = f"Inventory status update for {context.material_name}."
-            risk = f"Current stock: {context.current_stock:.0f} units with {context.days_of_stock:.1f} days of coverage."
-            action = "Continue monitoring stock levels."
+        situation, risk, action = _MESSAGE_PARTS.get(context.alert_type, _DEFAULT_MESSAGE_PARTS)
         
-        return f"""NEXUS Inventory Alert
-
-{situation}
-
-Location: {context.warehouse_name} ({context.warehouse_code})
-Material: {context.material_name} ({context.material_code})
-Location: {context.location}
-
-Stock Status:
-- Current Stock: {context.current_stock:.0f} units
-- Reorder Point: {context.reorder_point:.0f} units  
-- Days of Stock: {context.days_of_stock:.1f} days
-- UTR (Understock Ratio): {context.utr:.1%}
-- OTR (Overstock Ratio): {context.otr:.1%}
-
-{risk}
-
-Recommended Action:
-{action}
-
----
-This is an automated alert from NEXUS Inventory Management System.
-POWERGRID Corporation of India Limited"""
+        overstock_pct = 0.0
+        if context.alert_type == AlertType.OVERSTOCK:
+            overstock_pct = ((context.current_stock / context.max_stock_level) - 1) * 100
+        
+        return _MESSAGE_TEMPLATE.format(
+            situation=situation.format(c=context),
+            risk=risk.format(c=context, overstock_pct=overstock_pct),
+            action=action,
+            c=context
+        )
 
     def _default_whatsapp(self, context: AlertContext) -> str:
         """Generate default WhatsApp message"""
-        severity_emoji = {"RED": "🔴", "AMBER": "🟡", "GREEN": "🟢"}.get(context.severity, "📦")
-        alert_type = context.alert_type.value.upper()
-        
-        return f"""{severity_emoji} NEXUS {alert_type}
-Material: {context.material_name}
-Location: {context.warehouse_code}
-Stock: {context.current_stock:.0f} units
-Days left: {context.days_of_stock:.1f}
-UTR: {context.utr:.1%} | OTR: {context.otr:.1%}"""
+        return _WHATSAPP_TEMPLATE.format(
+            emoji=_SEVERITY_EMOJI.get(context.severity, "📦"),
+            alert_type=context.alert_type.value.upper(),
+            c=context
+        )
 
     def _default_actions(self, context: AlertContext) -> list:
         """Generate default recommended actions"""
-        if context.alert_type == AlertType.UNDERSTOCK or context.utr > 0.3:
-            return [
-                f"Initiate purchase order for {context.reorder_point - context.current_stock:.0f} units",
-                f"Check with nearby warehouses for emergency transfer",
-                "Review upcoming project requirements",
-                "Contact approved vendors for fastest delivery"
-            ]
-        elif context.alert_type == AlertType.OVERSTOCK or context.otr > 0.3:
-            return [
-                "Identify warehouses with low stock for transfer",
-                "Review upcoming project pipeline for utilization",
-                "Consider postponing incoming orders",
-                "Evaluate storage optimization options"
-            ]
-        else:
-            return [
-                "Continue regular monitoring",
-                "Review demand forecasts",
-                "Maintain safety stock levels"
-            ]
+        return list(context._actions)
     
     def _default_urgency(self, context: AlertContext) -> str:
         """Determine default urgency level"""
-        if context.severity == "RED" or context.utr > 0.7:
-            return "IMMEDIATE"
-        elif context.severity == "AMBER" or context.utr > 0.5:
-            return "HIGH"
-        elif context.utr > 0.2 or context.otr > 0.2:
-            return "MEDIUM"
-        else:
-            return "LOW"
+        return context._urgency
     
     def _default_summary(self, context: AlertContext) -> str:
         """Generate default summary"""
-        if context.alert_type == AlertType.UNDERSTOCK:
-            return f"{context.material_code} at {context.warehouse_code}: {context.days_of_stock:.0f} days of stock remaining"
-        elif context.alert_type == AlertType.OVERSTOCK:
-            return f"{context.material_code} at {context.warehouse_code}: {context.otr:.0%} overstocked"
-        else:
-            return f"{context.material_code} at {context.warehouse_code}: Stock level update"
+        return context._summary
     
     def generate_report_content(
         self,
@@ -461,10 +1129,10 @@ UTR: {context.utr:.1%} | OTR: {context.otr:.1%}"""
             return self._fallback_report(material_name, current_stock, optimal_stock, metrics)
         
         try:
-            history_summary = "\n".join([
-                f"- {h.get('date', 'N/A')}: {h.get('action', 'N/A')} - {h.get('quantity', 0)} units"
+            history_summary = "\n".join(
+                _HIST_FMT(date=h.get('date', 'N/A'), action=h.get('action', 'N/A'), qty=h.get('quantity', 0))
                 for h in (history[:10] if history else [])  # Last 10 entries
-            ])
+            )
             
             prompt = f"""Generate a concise inventory report for:
 
@@ -484,55 +1152,60 @@ Recent History:
 
 Provide a 2-3 paragraph analysis with key findings and recommendations."""
 
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    self.GROQ_API_URL,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": "You are NEXUS, an inventory management AI. Generate clear, professional inventory reports."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.5,
-                        "max_tokens": 800
-                    }
-                )
+            response = self._post_groq({
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": "You are NEXUS, an inventory management AI. Generate clear, professional inventory reports."},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.5,
+                "max_tokens": self.report_max_tokens
+            })
+            
+            if response.status_code == 200:
+                data = _json_loads(response.content)
+                return data["choices"][0]["message"]["content"]
+            else:
+                return self._fallback_report(material_name, current_stock, optimal_stock, metrics)
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    return self._fallback_report(material_name, current_stock, optimal_stock, metrics)
-                    
         except Exception as e:
-            logger.error(f"Report generation failed: {str(e)}")
+            logger.error("Report generation failed: %s", e)
             return self._fallback_report(material_name, current_stock, optimal_stock, metrics)
     
     def _fallback_report(self, material_name: str, current_stock: float, optimal_stock: float, metrics: dict) -> str:
         """Generate fallback report when LLM is unavailable"""
         gap = optimal_stock - current_stock
-        status = "understocked" if gap > 0 else "overstocked" if gap < 0 else "optimal"
+        status, gap_label, recommendation = _REPORT_STATUS[(gap > 0) - (gap < 0)]
         
-        return f"""Inventory Report: {material_name}
-
-Current Status: Stock is currently {status}.
-- Current Stock: {current_stock:.0f} units
-- Optimal Level: {optimal_stock:.0f} units
-- Gap: {abs(gap):.0f} units {'needed' if gap > 0 else 'excess' if gap < 0 else ''}
+        return _REPORT_TEMPLATE.format(
+            material_name=material_name,
+            status=status,
+            current_stock=current_stock,
+            optimal_stock=optimal_stock,
+            gap=abs(gap),
+            gap_label=gap_label,
+            utr=metrics.get('utr', 0),
+            otr=metrics.get('otr', 0),
+            days_of_stock=metrics.get('days_of_stock', 0),
+            recommendation=recommendation
+        )
 
-Key Metrics:
-- Understock Ratio (UTR): {metrics.get('utr', 0):.1%}
-- Overstock Ratio (OTR): {metrics.get('otr', 0):.1%}
-- Days of Stock: {metrics.get('days_of_stock', 0):.1f}
 
-Recommendation: {'Initiate procurement to restore optimal levels.' if gap > 0 else 'Consider redistribution to balance inventory.' if gap < 0 else 'Maintain current stock management practices.'}"""
+# Convenience function for quick access
+_llm_service: Optional[LLMService] = None
 
 
-# Convenience function for quick access
 def get_llm_service() -> LLMService:
-    """Get a configured LLM service instance"""
-    return LLMService()
+    """Get the shared LLM service instance (one connection pool per process)"""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
+
+
+async def close_llm_service():
+    """Release the shared service's pooled connections, if it was created"""
+    global _llm_service
+    if _llm_service is not None:
+        service, _llm_service = _llm_service, None  # The next get_llm_service() builds a fresh one
+        await service.aclose()
@@ -5,7 +5,7 @@ Unified notification service supporting multiple channels:
 - WhatsApp (via Meta Graph API)
 - Email (via Postmark API)
 
-Environment Variables Required:
+Environment Variables Required (.env is loaded by the app entry point):
 - META_BEARER_TOKEN: Meta Graph API token for WhatsApp
 - PHONE_NUMBER_ID: WhatsApp Business phone number ID
 - POSTMARK_SERVER_TOKEN: Postmark API token for email
@@ -13,20 +13,132 @@ Environment Variables Required:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import io
 import json
 import logging
 import os
-from typing import Optional, Dict, List
-from dataclasses import dataclass
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from functools import cached_property
+from types import MappingProxyType
+from typing import Optional, Dict, List, Mapping, BinaryIO, Union
+from dataclasses import dataclass, replace
 from enum import Enum
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv(override=True)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from requests_toolbelt import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    TOOLBELT_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(obj) -> bytes:
+    """
+    Serialize a request body, using orjson when available.
+    
+    Bodies are passed as data=bytes with Content-Type set in the
+    precomputed headers, rather than json=, so requests and aiohttp send
+    them as-is instead of re-encoding through the stdlib json module.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data):
+    """Parse a JSON str/bytes body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _parse_json(response: requests.Response):
+    """Parse a requests response body as JSON"""
+    return _json_loads(response.content)
+
+
+def _extract_error(raw: bytes) -> str:
+    """
+    Pull a human-readable error out of a Graph API or Postmark error body.
+    
+    The body is parsed at most once; non-JSON bodies (e.g. an HTML 502
+    from a proxy) are returned as text with undecodable bytes replaced.
+    
+    Args:
+        raw: Raw response body
+        
+    Returns:
+        Error message string
+    """
+    try:
+        data = _json_loads(raw)
+    except ValueError:
+        return raw.decode("utf-8", "replace")
+    if isinstance(data, dict):
+        error = data.get("error")
+        message = (error.get("message") if isinstance(error, dict) else None) or data.get("Message")
+        if message:
+            return message
+    return raw.decode("utf-8", "replace")
+
+
+# E.164 phone numbers (country code, no leading zero) and plain email addresses
+_PHONE_RE = re.compile(r"^\+?[1-9]\d{7,14}$")
+_PHONE_SEPARATORS_RE = re.compile(r"[\s\-().]")
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _is_valid_phone(number: str) -> bool:
+    """Check a phone number locally before spending an API round-trip on it"""
+    return bool(_PHONE_RE.match(_PHONE_SEPARATORS_RE.sub("", number)))
+
+
+def _join_addresses(addresses: Union[str, List[str], None]) -> Optional[str]:
+    """Join a recipient list into Postmark's comma-separated form (strings pass through)"""
+    if not addresses:
+        return None
+    if isinstance(addresses, str):
+        return addresses
+    return ", ".join(addresses)
+
+
+def _build_template_components(template_params: Optional[Dict]) -> List[Dict]:
+    """
+    Build the components list for a WhatsApp template message.
+    
+    Args:
+        template_params: Body parameter values, in template placeholder order
+        
+    Returns:
+        List with a single body component, or empty if there are no params
+    """
+    if not template_params:
+        return []
+    return [{
+        "type": "body",
+        "parameters": [{"type": "text", "text": v} for v in template_params.values()]
+    }]
+
+
 class NotificationChannel(Enum):
     """Supported notification channels"""
     WHATSAPP = "whatsapp"
@@ -34,7 +146,7 @@ class NotificationChannel(Enum):
     SMS = "sms"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NotificationResult:
     """Result of a notification attempt"""
     success: bool
@@ -80,6 +192,21 @@ class NotificationService:
     
     # Postmark API URL
     POSTMARK_API_URL = "https://api.postmarkapp.com/email"
+    POSTMARK_BATCH_URL = "https://api.postmarkapp.com/email/batch"
+    POSTMARK_BATCH_SIZE = 500  # Postmark's per-request message limit
+    
+    # Keep-alive connection pool per API host
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 50
+    
+    # Default thread count for send_bulk_alerts
+    BULK_MAX_WORKERS = 32
+    
+    # Transport retries: connection failures, plus statuses where the API
+    # did not process the message (so a resend cannot duplicate it)
+    RETRY_TOTAL = 3
+    RETRY_BACKOFF_FACTOR = 0.5
+    RETRY_STATUSES = (429, 503)
     
     def __init__(
         self,
@@ -87,12 +214,14 @@ class NotificationService:
         whatsapp_phone_id: str = None,
         postmark_token: str = None,
         sender_email: str = None,
-        default_whatsapp_recipient: str = None
+        default_whatsapp_recipient: str = None,
+        default_cc: Union[str, List[str]] = None
     ):
         """
         Initialize notification service with credentials.
         
         Falls back to environment variables if not provided.
+        default_cc is copied on every email that does not set its own cc.
         """
         # WhatsApp credentials (Meta Graph API)
         self.whatsapp_token = whatsapp_token or os.getenv("META_BEARER_TOKEN")
@@ -102,6 +231,79 @@ class NotificationService:
         # Postmark credentials
         self.postmark_token = postmark_token or os.getenv("POSTMARK_SERVER_TOKEN")
         self.sender_email = sender_email or os.getenv("DEFAULT_SENDER_EMAIL")
+        self.default_cc = _join_addresses(default_cc)
+        
+        # send_alert handlers: (recipient, subject, message, html_body, fallback) -> result
+        self._channel_dispatch = {
+            NotificationChannel.WHATSAPP: self._dispatch_whatsapp,
+            NotificationChannel.EMAIL: self._dispatch_email
+        }
+        
+        # One persistent session per API host: reuses TCP/TLS connections and
+        # carries that host's auth headers as session defaults
+        self._wa_session = self._new_session("https://graph.facebook.com")
+        self._pm_session = self._new_session("https://api.postmarkapp.com")
+        
+        self._rebuild_headers()
+    
+    def _new_session(self, prefix: str) -> requests.Session:
+        """Create a pooled session with transient-failure retries mounted for prefix"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(
+                total=self.RETRY_TOTAL,
+                read=0,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=frozenset(["POST"]),
+                backoff_factor=self.RETRY_BACKOFF_FACTOR,
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        session.mount(prefix, adapter)
+        return session
+    
+    def _rebuild_headers(self):
+        """Precompute endpoint URLs and request headers (call again if credentials change)"""
+        # The cached configuration status reflects the old credentials
+        self.__dict__.pop("configuration_status", None)
+        
+        graph_base = f"https://graph.facebook.com/{self.GRAPH_API_VERSION}/{self.whatsapp_phone_id}"
+        self._wa_messages_url = f"{graph_base}/messages"
+        self._wa_media_url = f"{graph_base}/media"
+        
+        self._wa_json_headers = {
+            "Authorization": f"Bearer {self.whatsapp_token}",
+            "Content-Type": "application/json"
+        }
+        self._postmark_headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "X-Postmark-Server-Token": self.postmark_token
+        }
+        self._wa_session.headers.update(self._wa_json_headers)
+        self._pm_session.headers.update(self._postmark_headers)
+        
+        # Streamed multipart bodies cannot be rewound, so uploads only retry failed connects
+        upload_adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(total=self.RETRY_TOTAL, read=0, status=0, backoff_factor=self.RETRY_BACKOFF_FACTOR)
+        )
+        self._wa_session.mount(self._wa_media_url, upload_adapter)
+    
+    def close(self):
+        """Close pooled connections"""
+        self._wa_session.close()
+        self._pm_session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     # =========================================================================
     # WHATSAPP (Meta Graph API)
@@ -146,12 +348,15 @@ class NotificationService:
                 error="No recipient phone number provided. Set WHATSAPP_BUSINESS_NUMBER in .env or pass phone_number"
             )
         
-        url = f"https://graph.facebook.com/{self.GRAPH_API_VERSION}/{self.whatsapp_phone_id}/messages"
+        if not _is_valid_phone(recipient):
+            return NotificationResult(
+                success=False,
+                channel="whatsapp",
+                recipient=recipient,
+                error=f"Invalid phone number: {recipient}. Use the international format, e.g. 919343584820"
+            )
         
-        headers = {
-            "Authorization": f"Bearer {self.whatsapp_token}",
-            "Content-Type": "application/json"
-        }
+        url = self._wa_messages_url
         
         # Build payload
         if template_name:
@@ -162,16 +367,9 @@ class NotificationService:
                 "template": {
                     "name": template_name,
                     "language": {"code": "en"},
-                    "components": []
+                    "components": _build_template_components(template_params)
                 }
             }
-            if template_params:
-                payload["template"]["components"].append({
-                    "type": "body",
-                    "parameters": [
-                        {"type": "text", "text": v} for v in template_params.values()
-                    ]
-                })
         else:
             payload = {
                 "messaging_product": "whatsapp",
@@ -181,17 +379,19 @@ class NotificationService:
             }
         
         try:
-            response = requests.post(
+            response = self._wa_session.post(
                 url, 
-                headers=headers, 
-                data=json.dumps(payload),
+                data=_json_dumps(payload),
                 timeout=30
             )
             
             if response.status_code in [200, 201]:
-                data = response.json()
-                message_id = data.get("messages", [{}])[0].get("id")
-                logger.info(f"✔ WhatsApp sent to {recipient}: {message_id}")
+                data = _parse_json(response)
+                try:
+                    message_id = data["messages"][0]["id"]
+                except (KeyError, IndexError, TypeError):
+                    message_id = None
+                logger.info("✔ WhatsApp sent to %s: %s", recipient, message_id)
                 return NotificationResult(
                     success=True,
                     channel="whatsapp",
@@ -199,9 +399,8 @@ class NotificationService:
                     message_id=message_id
                 )
             else:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", response.text)
-                logger.error(f"❌ WhatsApp failed: {error_msg}")
+                error_msg = _extract_error(response.content)
+                logger.error("❌ WhatsApp failed: %s", error_msg)
                 return NotificationResult(
                     success=False,
                     channel="whatsapp",
@@ -210,7 +409,7 @@ class NotificationService:
                 )
                 
         except Exception as e:
-            logger.exception(f"❌ WhatsApp exception: {e}")
+            logger.exception("❌ WhatsApp exception: %s", e)
             return NotificationResult(
                 success=False,
                 channel="whatsapp",
@@ -220,15 +419,18 @@ class NotificationService:
     
     def upload_whatsapp_media(
         self,
-        file_bytes: bytes,
+        file_bytes: Union[BinaryIO, bytes],
         mime_type: str = "application/pdf",
         filename: str = "document.pdf"
     ) -> Optional[str]:
         """
         Upload media to WhatsApp for sending as document.
         
+        With requests_toolbelt installed the multipart body is streamed from
+        file_bytes instead of being assembled in memory.
+        
         Args:
-            file_bytes: File content as bytes
+            file_bytes: File content as bytes or a binary file-like object
             mime_type: MIME type of the file
             filename: Name of the file
             
@@ -239,34 +441,44 @@ class NotificationService:
             logger.error("WhatsApp credentials not configured")
             return None
         
-        url = f"https://graph.facebook.com/{self.GRAPH_API_VERSION}/{self.whatsapp_phone_id}/media"
+        url = self._wa_media_url
         
-        headers = {
-            "Authorization": f"Bearer {self.whatsapp_token}"
-        }
-        
-        files = {
-            "file": (filename, file_bytes, mime_type),
-            "messaging_product": (None, "whatsapp"),
-            "type": (None, mime_type)
-        }
+        file_obj = io.BytesIO(file_bytes) if isinstance(file_bytes, (bytes, bytearray)) else file_bytes
         
         try:
-            response = requests.post(url, headers=headers, files=files, timeout=60)
+            if TOOLBELT_AVAILABLE:
+                encoder = MultipartEncoder(fields={
+                    "file": (filename, file_obj, mime_type),
+                    "messaging_product": "whatsapp",
+                    "type": mime_type
+                })
+                response = self._wa_session.post(
+                    url,
+                    headers={"Content-Type": encoder.content_type},
+                    data=encoder,
+                    timeout=60
+                )
+            else:
+                files = {
+                    "file": (filename, file_obj, mime_type),
+                    "messaging_product": (None, "whatsapp"),
+                    "type": (None, mime_type)
+                }
+                # Drop the session's JSON content type so requests sets the multipart boundary
+                response = self._wa_session.post(url, headers={"Content-Type": None}, files=files, timeout=60)
             
             if response.status_code in [200, 201]:
-                data = response.json()
+                data = _parse_json(response)
                 media_id = data.get("id")
-                logger.info(f"✔ WhatsApp media uploaded: {media_id}")
+                logger.info("✔ WhatsApp media uploaded: %s", media_id)
                 return media_id
             else:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", response.text)
-                logger.error(f"❌ WhatsApp media upload failed: {error_msg}")
+                error_msg = _extract_error(response.content)
+                logger.error("❌ WhatsApp media upload failed: %s", error_msg)
                 return None
                 
         except Exception as e:
-            logger.exception(f"❌ WhatsApp media upload exception: {e}")
+            logger.exception("❌ WhatsApp media upload exception: %s", e)
             return None
     
     def send_whatsapp_document(
@@ -310,6 +522,14 @@ class NotificationService:
                 error="No recipient phone number provided"
             )
         
+        if not _is_valid_phone(recipient):
+            return NotificationResult(
+                success=False,
+                channel="whatsapp",
+                recipient=recipient,
+                error=f"Invalid phone number: {recipient}"
+            )
+        
         # If we have bytes, upload first to get media_id
         media_id = None
         if document_bytes:
@@ -326,12 +546,7 @@ class NotificationService:
                     error="Failed to upload document to WhatsApp"
                 )
         
-        url = f"https://graph.facebook.com/{self.GRAPH_API_VERSION}/{self.whatsapp_phone_id}/messages"
-        
-        headers = {
-            "Authorization": f"Bearer {self.whatsapp_token}",
-            "Content-Type": "application/json"
-        }
+        url = self._wa_messages_url
         
         # Build document payload
         document_payload = {"filename": filename}
@@ -359,17 +574,19 @@ class NotificationService:
         }
         
         try:
-            response = requests.post(
+            response = self._wa_session.post(
                 url,
-                headers=headers,
-                data=json.dumps(payload),
+                data=_json_dumps(payload),
                 timeout=30
             )
             
             if response.status_code in [200, 201]:
-                data = response.json()
-                message_id = data.get("messages", [{}])[0].get("id")
-                logger.info(f"✔ WhatsApp document sent to {recipient}: {message_id}")
+                data = _parse_json(response)
+                try:
+                    message_id = data["messages"][0]["id"]
+                except (KeyError, IndexError, TypeError):
+                    message_id = None
+                logger.info("✔ WhatsApp document sent to %s: %s", recipient, message_id)
                 return NotificationResult(
                     success=True,
                     channel="whatsapp",
@@ -377,9 +594,8 @@ class NotificationService:
                     message_id=message_id
                 )
             else:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", response.text)
-                logger.error(f"❌ WhatsApp document failed: {error_msg}")
+                error_msg = _extract_error(response.content)
+                logger.error("❌ WhatsApp document failed: %s", error_msg)
                 return NotificationResult(
                     success=False,
                     channel="whatsapp",
@@ -388,7 +604,7 @@ class NotificationService:
                 )
                 
         except Exception as e:
-            logger.exception(f"❌ WhatsApp document exception: {e}")
+            logger.exception("❌ WhatsApp document exception: %s", e)
             return NotificationResult(
                 success=False,
                 channel="whatsapp",
@@ -406,8 +622,8 @@ class NotificationService:
         subject: str,
         body: str,
         html_body: str = None,
-        cc: List[str] = None,
-        bcc: List[str] = None,
+        cc: Union[str, List[str]] = None,
+        bcc: Union[str, List[str]] = None,
         attachments: List[Dict] = None
     ) -> NotificationResult:
         """
@@ -418,8 +634,9 @@ class NotificationService:
             subject: Email subject
             body: Plain text body
             html_body: Optional HTML body
-            cc: Optional CC recipients
-            bcc: Optional BCC recipients
+            cc: Optional CC recipients, as a list or a pre-joined string
+                (defaults to the service's default_cc)
+            bcc: Optional BCC recipients, as a list or a pre-joined string
             attachments: Optional list of attachments, each with:
                 - Name: filename (e.g., "report.pdf")
                 - Content: base64-encoded content
@@ -444,12 +661,6 @@ class NotificationService:
                 error="Sender email not configured. Set DEFAULT_SENDER_EMAIL in .env"
             )
         
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "X-Postmark-Server-Token": self.postmark_token
-        }
-        
         payload = {
             "From": self.sender_email,
             "To": to_email,
@@ -460,54 +671,168 @@ class NotificationService:
         if html_body:
             payload["HtmlBody"] = html_body
         
+        cc = _join_addresses(cc) or self.default_cc
         if cc:
-            payload["Cc"] = ", ".join(cc)
+            payload["Cc"] = cc
         
         if bcc:
-            payload["Bcc"] = ", ".join(bcc)
+            payload["Bcc"] = _join_addresses(bcc)
         
         # Add attachments if provided
         if attachments:
             payload["Attachments"] = attachments
         
         try:
-            response = requests.post(
+            raw_body = _json_dumps(payload)
+        except (TypeError, ValueError) as e:
+            logger.exception("❌ Email exception: %s", e)
+            return NotificationResult(
+                success=False,
+                channel="email",
+                recipient=to_email,
+                error=str(e)
+            )
+        
+        return self.send_email_raw(raw_body, to_email)
+    
+    def send_email_raw(self, body: bytes, recipient: str) -> NotificationResult:
+        """
+        Send a prebuilt Postmark JSON message body.
+        
+        Lets callers that already hold the serialized message (e.g. with
+        large base64 attachments) send it without another encode pass.
+        
+        Args:
+            body: UTF-8 JSON body in Postmark's single-email format
+            recipient: Recipient address, used for the result and logging
+        
+        Returns:
+            NotificationResult with success status
+        """
+        if not self.postmark_token:
+            return NotificationResult(
+                success=False,
+                channel="email",
+                recipient=recipient,
+                error="Postmark credentials not configured. Set POSTMARK_SERVER_TOKEN in .env"
+            )
+        
+        try:
+            response = self._pm_session.post(
                 self.POSTMARK_API_URL,
-                headers=headers,
-                data=json.dumps(payload),
+                data=body,
                 timeout=30
             )
             
             if response.status_code == 200:
-                data = response.json()
-                message_id = data.get("MessageID")
-                logger.info(f"✔ Email sent to {to_email}: {message_id}")
+                data = _parse_json(response)
+                try:
+                    message_id = data["MessageID"]
+                except (KeyError, TypeError):
+                    message_id = None
+                logger.info("✔ Email sent to %s: %s", recipient, message_id)
                 return NotificationResult(
                     success=True,
                     channel="email",
-                    recipient=to_email,
+                    recipient=recipient,
                     message_id=message_id
                 )
             else:
-                error_data = response.json()
-                error_msg = error_data.get("Message", response.text)
-                logger.error(f"❌ Email failed: {error_msg}")
+                error_msg = _extract_error(response.content)
+                logger.error("❌ Email failed: %s", error_msg)
                 return NotificationResult(
                     success=False,
                     channel="email",
-                    recipient=to_email,
+                    recipient=recipient,
                     error=error_msg
                 )
                 
         except Exception as e:
-            logger.exception(f"❌ Email exception: {e}")
+            logger.exception("❌ Email exception: %s", e)
             return NotificationResult(
                 success=False,
                 channel="email",
-                recipient=to_email,
+                recipient=recipient,
                 error=str(e)
             )
     
+    def send_email_batch(self, messages: List[Dict]) -> List[NotificationResult]:
+        """
+        Send up to POSTMARK_BATCH_SIZE plain-text emails in one Postmark request.
+        
+        Args:
+            messages: List of dicts with 'recipient', 'subject', 'message'
+        
+        Returns:
+            List of NotificationResults in the same order as messages
+        """
+        if not messages:
+            return []
+        
+        if not self.postmark_token or not self.sender_email:
+            error = "Postmark credentials not configured. Set POSTMARK_SERVER_TOKEN and DEFAULT_SENDER_EMAIL in .env"
+            return [
+                NotificationResult(success=False, channel="email", recipient=m["recipient"], error=error)
+                for m in messages
+            ]
+        
+        payload = [
+            {
+                "From": self.sender_email,
+                "To": m["recipient"],
+                "Subject": m["subject"],
+                "TextBody": m["message"]
+            }
+            for m in messages
+        ]
+        if self.default_cc:
+            for item in payload:
+                item["Cc"] = self.default_cc
+        
+        try:
+            response = self._pm_session.post(
+                self.POSTMARK_BATCH_URL,
+                data=_json_dumps(payload),
+                timeout=60
+            )
+            
+            if response.status_code == 200:
+                # One entry per message, in request order
+                results = []
+                for m, item in zip(messages, _parse_json(response)):
+                    if item.get("ErrorCode", 0) == 0:
+                        results.append(NotificationResult(
+                            success=True,
+                            channel="email",
+                            recipient=m["recipient"],
+                            message_id=item.get("MessageID")
+                        ))
+                    else:
+                        results.append(NotificationResult(
+                            success=False,
+                            channel="email",
+                            recipient=m["recipient"],
+                            error=item.get("Message")
+                        ))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "✔ Email batch sent: %d/%d accepted",
+                        sum(r.success for r in results), len(messages)
+                    )
+                return results
+            else:
+                error_msg = _extract_error(response.content)
+                logger.error("❌ Email batch failed: %s", error_msg)
+                
+        except Exception as e:
+            logger.exception("❌ Email batch exception: %s", e)
+            error_msg = str(e)
+        
+        return [
+            NotificationResult(success=False, channel="email", recipient=m["recipient"], error=error_msg)
+            for m in messages
+        ]
+    
     # =========================================================================
     # UNIFIED ALERT SENDER
     # =========================================================================
@@ -535,84 +860,397 @@ class NotificationService:
         Returns:
             NotificationResult
         """
-        full_message = f"🚨 {subject}\n\n{message}"
-        
-        if channel == NotificationChannel.WHATSAPP:
-            result = self.send_whatsapp(recipient, full_message)
-            
-            # Fallback to email if WhatsApp fails and recipient looks like email
-            if not result.success and fallback and "@" in recipient:
-                logger.info(f"WhatsApp failed, falling back to email")
-                return self.send_email(recipient, subject, message, html_body)
-            return result
-        
-        elif channel == NotificationChannel.EMAIL:
-            result = self.send_email(recipient, subject, message, html_body)
-            return result
-        
-        else:
+        handler = self._channel_dispatch.get(channel)
+        if handler is None:
             return NotificationResult(
                 success=False,
                 channel=channel.value,
                 recipient=recipient,
                 error=f"Channel {channel.value} not implemented"
             )
+        return handler(recipient, subject, message, html_body, fallback)
+    
+    def _dispatch_whatsapp(
+        self,
+        recipient: str,
+        subject: str,
+        message: str,
+        html_body: Optional[str],
+        fallback: bool
+    ) -> NotificationResult:
+        """send_alert handler for WhatsApp (falls back to email for email recipients)"""
+        result = self.send_whatsapp(recipient, f"🚨 {subject}\n\n{message}")
+        
+        # Fallback to email if WhatsApp fails and recipient looks like email
+        if not result.success and fallback and _EMAIL_RE.match(recipient):
+            logger.info("WhatsApp failed, falling back to email")
+            return self.send_email(recipient, subject, message, html_body)
+        return result
+    
+    def _dispatch_email(
+        self,
+        recipient: str,
+        subject: str,
+        message: str,
+        html_body: Optional[str],
+        fallback: bool
+    ) -> NotificationResult:
+        """send_alert handler for email"""
+        return self.send_email(recipient, subject, message, html_body)
+    
+    def _bulk_config_error(self, alerts: List[Dict], channel: NotificationChannel) -> Optional[NotificationResult]:
+        """
+        Return the shared error result when no alert in a bulk send can succeed.
+        
+        WhatsApp alerts to email-looking recipients can still fall back to
+        email, so a misconfigured WhatsApp channel only short-circuits when
+        none of the recipients would take that path.
+        
+        Returns:
+            Error NotificationResult to fan out, or None to send normally
+        """
+        status = self.configuration_status
+        
+        if channel == NotificationChannel.EMAIL and not status["email"]["configured"]:
+            return NotificationResult(
+                success=False,
+                channel="email",
+                recipient="",
+                error="Postmark credentials not configured. Set POSTMARK_SERVER_TOKEN and DEFAULT_SENDER_EMAIL in .env"
+            )
+        
+        if (
+            channel == NotificationChannel.WHATSAPP
+            and not status["whatsapp"]["configured"]
+            and not any(_EMAIL_RE.match(alert["recipient"]) for alert in alerts)
+        ):
+            return NotificationResult(
+                success=False,
+                channel="whatsapp",
+                recipient=self.default_whatsapp_recipient or "unknown",
+                error="WhatsApp credentials not configured. Set META_BEARER_TOKEN and PHONE_NUMBER_ID in .env"
+            )
+        
+        return None
     
     def send_bulk_alerts(
         self,
         alerts: List[Dict],
-        channel: NotificationChannel = NotificationChannel.EMAIL
+        channel: NotificationChannel = NotificationChannel.EMAIL,
+        max_workers: int = None
     ) -> List[NotificationResult]:
         """
-        Send multiple alerts.
+        Send multiple alerts over the shared session.
+        
+        Emails go through the Postmark batch endpoint (up to 500 per request);
+        other channels are sent concurrently on a thread pool.
         
         Args:
             alerts: List of dicts with 'recipient', 'subject', 'message'
             channel: Notification channel
+            max_workers: Maximum concurrent sends for non-email channels (default BULK_MAX_WORKERS)
         
         Returns:
-            List of NotificationResults
+            List of NotificationResults in the same order as alerts
         """
-        results = []
-        for alert in alerts:
-            result = self.send_alert(
+        if not alerts:
+            return []
+        
+        error = self._bulk_config_error(alerts, channel)
+        if error is not None:
+            return [replace(error, recipient=alert["recipient"] or error.recipient) for alert in alerts]
+        
+        if channel == NotificationChannel.EMAIL:
+            # Postmark batch endpoint: one request per POSTMARK_BATCH_SIZE emails
+            results = []
+            for start in range(0, len(alerts), self.POSTMARK_BATCH_SIZE):
+                results.extend(self.send_email_batch(alerts[start:start + self.POSTMARK_BATCH_SIZE]))
+            return results
+        
+        def _send(alert: Dict) -> NotificationResult:
+            return self.send_alert(
                 recipient=alert["recipient"],
                 subject=alert["subject"],
                 message=alert["message"],
                 channel=channel
             )
-            results.append(result)
-        return results
+        
+        workers = min(max_workers or self.BULK_MAX_WORKERS, len(alerts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notify") as executor:
+            return list(executor.map(_send, alerts))
+    
+    # =========================================================================
+    # ASYNC BULK SENDER
+    # =========================================================================
+    
+    async def _send_whatsapp_async(
+        self,
+        session: "aiohttp.ClientSession",
+        phone_number: str,
+        message: str
+    ) -> NotificationResult:
+        """Async counterpart of send_whatsapp for text messages"""
+        recipient = phone_number or self.default_whatsapp_recipient
+        
+        if not self.whatsapp_token or not self.whatsapp_phone_id or not recipient or not _is_valid_phone(recipient):
+            # Configuration and validation errors are returned without any HTTP call
+            return self.send_whatsapp(phone_number, message)
+        
+        url = self._wa_messages_url
+        headers = self._wa_json_headers
+        
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": recipient,
+            "type": "text",
+            "text": {"body": message}
+        }
+        
+        try:
+            async with session.post(url, headers=headers, data=_json_dumps(payload)) as response:
+                raw = await response.read()
+                
+                if response.status in [200, 201]:
+                    data = _json_loads(raw)
+                    try:
+                        message_id = data["messages"][0]["id"]
+                    except (KeyError, IndexError, TypeError):
+                        message_id = None
+                    logger.info("✔ WhatsApp sent to %s: %s", recipient, message_id)
+                    return NotificationResult(
+                        success=True,
+                        channel="whatsapp",
+                        recipient=recipient,
+                        message_id=message_id
+                    )
+                
+                error_msg = _extract_error(raw)
+                logger.error("❌ WhatsApp failed: %s", error_msg)
+                return NotificationResult(
+                    success=False,
+                    channel="whatsapp",
+                    recipient=recipient,
+                    error=error_msg
+                )
+                
+        except Exception as e:
+            logger.exception("❌ WhatsApp exception: %s", e)
+            return NotificationResult(
+                success=False,
+                channel="whatsapp",
+                recipient=recipient,
+                error=str(e)
+            )
     
-    def get_configuration_status(self) -> Dict:
+    async def _send_email_async(
+        self,
+        session: "aiohttp.ClientSession",
+        to_email: str,
+        subject: str,
+        body: str,
+        html_body: str = None
+    ) -> NotificationResult:
+        """Async counterpart of send_email"""
+        if not self.postmark_token or not self.sender_email:
+            # Configuration errors are returned without any HTTP call
+            return self.send_email(to_email, subject, body, html_body)
+        
+        headers = self._postmark_headers
+        
+        payload = {
+            "From": self.sender_email,
+            "To": to_email,
+            "Subject": subject,
+            "TextBody": body
+        }
+        
+        if html_body:
+            payload["HtmlBody"] = html_body
+        
+        if self.default_cc:
+            payload["Cc"] = self.default_cc
+        
+        try:
+            async with session.post(self.POSTMARK_API_URL, headers=headers, data=_json_dumps(payload)) as response:
+                raw = await response.read()
+                
+                if response.status == 200:
+                    data = _json_loads(raw)
+                    try:
+                        message_id = data["MessageID"]
+                    except (KeyError, TypeError):
+                        message_id = None
+                    logger.info("✔ Email sent to %s: %s", to_email, message_id)
+                    return NotificationResult(
+                        success=True,
+                        channel="email",
+                        recipient=to_email,
+                        message_id=message_id
+                    )
+                
+                error_msg = _extract_error(raw)
+                logger.error("❌ Email failed: %s", error_msg)
+                return NotificationResult(
+                    success=False,
+                    channel="email",
+                    recipient=to_email,
+                    error=error_msg
+                )
+                
+        except Exception as e:
+            logger.exception("❌ Email exception: %s", e)
+            return NotificationResult(
+                success=False,
+                channel="email",
+                recipient=to_email,
+                error=str(e)
+            )
+    
+    async def _send_alert_async(
+        self,
+        session: "aiohttp.ClientSession",
+        alert: Dict,
+        channel: NotificationChannel
+    ) -> NotificationResult:
+        """Async counterpart of send_alert (with email fallback)"""
+        recipient, subject, message = alert["recipient"], alert["subject"], alert["message"]
+        
+        if channel == NotificationChannel.WHATSAPP:
+            result = await self._send_whatsapp_async(session, recipient, f"🚨 {subject}\n\n{message}")
+            
+            if not result.success and _EMAIL_RE.match(recipient):
+                logger.info("WhatsApp failed, falling back to email")
+                return await self._send_email_async(session, recipient, subject, message)
+            return result
+        
+        if channel == NotificationChannel.EMAIL:
+            return await self._send_email_async(session, recipient, subject, message)
+        
+        return self.send_alert(recipient, subject, message, channel=channel)
+    
+    async def send_bulk_alerts_async(
+        self,
+        alerts: List[Dict],
+        channel: NotificationChannel = NotificationChannel.EMAIL
+    ) -> List[NotificationResult]:
+        """
+        Send multiple alerts concurrently from async code.
+        
+        All sends share one aiohttp session, so thousands of alerts run on the
+        event loop over a handful of pooled connections. Falls back to the
+        threaded send_bulk_alerts when aiohttp is not installed.
+        
+        Args:
+            alerts: List of dicts with 'recipient', 'subject', 'message'
+            channel: Notification channel
+        
+        Returns:
+            List of NotificationResults in the same order as alerts
+        """
+        if not alerts:
+            return []
+        
+        error = self._bulk_config_error(alerts, channel)
+        if error is not None:
+            return [replace(error, recipient=alert["recipient"] or error.recipient) for alert in alerts]
+        
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self.send_bulk_alerts, alerts, channel)
+        
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=50, keepalive_timeout=75)
+        timeout = aiohttp.ClientTimeout(total=30)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            return list(await asyncio.gather(
+                *[self._send_alert_async(session, alert, channel) for alert in alerts]
+            ))
+    
+    @cached_property
+    def configuration_status(self) -> Mapping:
         """
         Check which notification channels are properly configured.
         
+        Built once per set of credentials (_rebuild_headers clears it) and
+        returned as a read-only mapping.
+        
         Returns:
-            Dict with configuration status for each channel
+            Mapping with configuration status for each channel
         """
-        return {
-            "whatsapp": {
+        return MappingProxyType({
+            "whatsapp": MappingProxyType({
                 "configured": bool(self.whatsapp_token and self.whatsapp_phone_id),
                 "has_token": bool(self.whatsapp_token),
                 "has_phone_id": bool(self.whatsapp_phone_id),
                 "default_recipient": self.default_whatsapp_recipient,
-                "required_env_vars": ["META_BEARER_TOKEN", "PHONE_NUMBER_ID"],
-                "optional_env_vars": ["WHATSAPP_BUSINESS_NUMBER"]
-            },
-            "email": {
+                "required_env_vars": ("META_BEARER_TOKEN", "PHONE_NUMBER_ID"),
+                "optional_env_vars": ("WHATSAPP_BUSINESS_NUMBER",)
+            }),
+            "email": MappingProxyType({
                 "configured": bool(self.postmark_token and self.sender_email),
                 "has_token": bool(self.postmark_token),
                 "sender_email": self.sender_email,
-                "required_env_vars": ["POSTMARK_SERVER_TOKEN", "DEFAULT_SENDER_EMAIL"]
-            }
-        }
+                "required_env_vars": ("POSTMARK_SERVER_TOKEN", "DEFAULT_SENDER_EMAIL")
+            })
+        })
+    
+    def get_configuration_status(self) -> Mapping:
+        """
+        Check which notification channels are properly configured.
+        
+        Returns:
+            Mapping with configuration status for each channel
+        """
+        return self.configuration_status
 
 
 # =========================================================================
 # CONVENIENCE FUNCTIONS
 # =========================================================================
 
+# Shared services keyed on resolved credentials, LRU ordered; evicted ones are closed
+_DEFAULT_SERVICES_MAX = 8
+_default_services: "OrderedDict[tuple, NotificationService]" = OrderedDict()
+_default_service_lock = threading.Lock()
+
+
+def _get_default_service(
+    whatsapp_token: str = None,
+    whatsapp_phone_id: str = None,
+    postmark_token: str = None,
+    sender_email: str = None
+) -> NotificationService:
+    """
+    Get a shared service for the given credentials.
+    
+    Missing credentials are resolved from the environment on every call, so
+    changed environment variables get a new instance. Instances (and their
+    connection pools) are reused across calls with the same credentials.
+    """
+    key = (
+        whatsapp_token or os.getenv("META_BEARER_TOKEN"),
+        whatsapp_phone_id or os.getenv("PHONE_NUMBER_ID"),
+        postmark_token or os.getenv("POSTMARK_SERVER_TOKEN"),
+        sender_email or os.getenv("DEFAULT_SENDER_EMAIL")
+    )
+    with _default_service_lock:
+        service = _default_services.get(key)
+        if service is not None:
+            _default_services.move_to_end(key)
+            return service
+        
+        service = NotificationService(*key)
+        _default_services[key] = service
+        if len(_default_services) > _DEFAULT_SERVICES_MAX:
+            _, evicted = _default_services.popitem(last=False)
+            evicted.close()
+        return service
+
+
+def get_notification_service() -> NotificationService:
+    """Get the shared notification service for the environment's credentials"""
+    return _get_default_service()
+
+
 def send_whatsapp(
     phone_number: str,
     message: str,
@@ -624,7 +1262,7 @@ def send_whatsapp(
     
     Returns dict with success status and message_id or error.
     """
-    service = NotificationService(
+    service = _get_default_service(
         whatsapp_token=token,
         whatsapp_phone_id=phone_number_id
     )
@@ -644,7 +1282,7 @@ def send_email(
     
     Returns dict with success status.
     """
-    service = NotificationService(
+    service = _get_default_service(
         postmark_token=postmark_token,
         sender_email=sender_email
     )
@@ -12,29 +12,183 @@ Reference: http://project-osrm.org/docs/v5.5.1/api/
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import httpx
+import json
+import numpy as np
 import logging
-from typing import Dict, Optional, Tuple
-from dataclasses import dataclass
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from enum import IntEnum
 import os
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401 - lets requests/httpx decode br responses
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Read once at import; .env is loaded by the entry point before services are imported
+_ENV_OSRM_URL = os.getenv("OSRM_URL")
+_ENV_OSRM_KEY = os.getenv("OSRM_API_KEY")
+
+# Table responses are large, highly compressible JSON; only offer br when we can decode it
+_ACCEPT_ENCODING = "br, gzip, deflate" if BROTLI_AVAILABLE else "gzip, deflate"
+
+EARTH_RADIUS_KM = 6371.0
+ROAD_DISTANCE_FACTOR = 1.3  # Road distance is typically 1.3x straight-line distance
+_ROAD_DIAMETER_KM = 2 * EARTH_RADIUS_KM * ROAD_DISTANCE_FACTOR
+
+
+class TransportMode(IntEnum):
+    """Supported transport modes (values index the per-mode tuples below)"""
+    ROAD = 0
+    EXPRESS = 1
+    RAIL = 2
+    AIR = 3
+
+
+_TRANSPORT_MODES = {mode.name.lower(): mode for mode in TransportMode}
+
+# Transport mode speed adjustments (road base), indexed by TransportMode
+_SPEED_MULTIPLIERS = (
+    1.0,    # road: Normal road speed
+    0.7,    # express: Faster (express highway/priority)
+    0.5,    # rail: 2x faster than road
+    0.1,    # air: 10x faster (for long distances)
+)
+
+# Average speeds (km/h) for the haversine fallback, indexed by TransportMode;
+# India road average is 40 km/h
+_FALLBACK_SPEEDS_KMH = (40.0, 60.0, 80.0, 500.0)
+
+
+def _parse_transport_mode(transport_mode: str) -> TransportMode:
+    """Resolve a mode name once at the API boundary (unknown modes are treated as road)"""
+    return _TRANSPORT_MODES.get(transport_mode, TransportMode.ROAD)
+
+
+def _fmt_coords(coords) -> str:
+    """Serialize (lat, lng) pairs as OSRM's ';'-separated lng,lat list at 6 dp (~0.1m)"""
+    return ";".join("%.6f,%.6f" % (lng, lat) for lat, lng in coords)
+
 
-@dataclass
+def _json_loads(data):
+    """Parse a JSON str/bytes body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_haversine_kernels = None
+
+
+def _get_haversine_kernels():
+    """
+    Compile the parallel haversine kernels with Numba on first use.
+    
+    Returns:
+        (pairs_kernel, matrix_kernel), or None when Numba is not installed
+    """
+    global _haversine_kernels
+    if _haversine_kernels is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _haversine_kernels = False
+            return None
+        
+        @njit(parallel=True, fastmath=True, cache=True)
+        def _pairs(lat1, lon1, lat2, lon2, out):
+            """Road distance (km) for each leg i; inputs in radians"""
+            for i in prange(lat1.shape[0]):
+                s_dlat = math.sin((lat2[i] - lat1[i]) * 0.5)
+                s_dlon = math.sin((lon2[i] - lon1[i]) * 0.5)
+                a = s_dlat * s_dlat + math.cos(lat1[i]) * math.cos(lat2[i]) * s_dlon * s_dlon
+                out[i] = _ROAD_DIAMETER_KM * math.asin(math.sqrt(a))
+        
+        @njit(parallel=True, fastmath=True, cache=True)
+        def _matrix(lat1, lon1, lat2, lon2, out):
+            """Road distance (km) from every origin i to every destination j; inputs in radians"""
+            for i in prange(lat1.shape[0]):
+                cos_lat1 = math.cos(lat1[i])
+                for j in range(lat2.shape[0]):
+                    s_dlat = math.sin((lat2[j] - lat1[i]) * 0.5)
+                    s_dlon = math.sin((lon2[j] - lon1[i]) * 0.5)
+                    a = s_dlat * s_dlat + cos_lat1 * math.cos(lat2[j]) * s_dlon * s_dlon
+                    out[i, j] = _ROAD_DIAMETER_KM * math.asin(math.sqrt(a))
+        
+        _haversine_kernels = (_pairs, _matrix)
+    return _haversine_kernels or None
+
+
+@lru_cache(maxsize=8192)
+def _format_minutes(total: int) -> str:
+    """Format a whole number of minutes; cached, since routes repeat the same few thousand values"""
+    if total < 60:
+        return "%d min" % total
+    
+    hours, mins = divmod(total, 60)
+    if hours < 24:
+        return "%dh %dm" % (hours, mins)
+    
+    days, hours = divmod(hours, 24)
+    if hours:
+        return "%dd %dh %dm" % (days, hours, mins)
+    return "%dd %dm" % (days, mins)
+
+
+def _format_duration(minutes: float) -> str:
+    """Format duration in human-readable format"""
+    return _format_minutes(int(minutes))
+
+
+@dataclass(slots=True)
 class RouteResult:
     """Result from OSRM route calculation"""
     distance_km: float
     duration_minutes: float
-    eta_readable: str
     source: str  # 'osrm' or 'haversine_fallback'
+    _eta_readable: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> dict:
-        return {
+    @property
+    def eta_readable(self) -> str:
+        """Human-readable ETA, formatted on first access"""
+        if self._eta_readable is None:
+            self._eta_readable = _format_duration(self.duration_minutes)
+        return self._eta_readable
+    
+    def to_dict(self, include_eta: bool = True) -> dict:
+        result = {
             "distance_km": round(self.distance_km, 2),
-            "duration_minutes": round(self.duration_minutes, 2),
-            "eta_readable": self.eta_readable,
-            "source": self.source
+            "duration_minutes": round(self.duration_minutes, 2)
         }
+        if include_eta:
+            result["eta_readable"] = self.eta_readable
+        result["source"] = self.source
+        return result
 
 
 class OSRMService:
@@ -50,18 +204,46 @@ class OSRMService:
     DEFAULT_OSRM_URL = "http://router.project-osrm.org"
     
     # Transport mode speed adjustments (road base)
-    TRANSPORT_SPEED_MULTIPLIERS = {
-        "road": 1.0,        # Normal road speed
-        "express": 0.7,     # Faster (express highway/priority)
-        "rail": 0.5,        # 2x faster than road
-        "air": 0.1,         # 10x faster (for long distances)
-    }
+    TRANSPORT_SPEED_MULTIPLIERS = dict(zip(_TRANSPORT_MODES, _SPEED_MULTIPLIERS))
+    
+    # Batch size from which the Numba kernels beat NumPy's temporaries
+    NUMBA_MIN_BATCH = 2000
+    
+    # Distance matrices are requested as tiles of at most this many origins x destinations
+    MATRIX_TILE_SIZE = 100
+    
+    # Average speeds (km/h) for the haversine fallback
+    FALLBACK_SPEEDS_KMH = dict(zip(_TRANSPORT_MODES, _FALLBACK_SPEEDS_KMH))
+    
+    # Keep-alive connection pool for the OSRM host
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 128
+    
+    # GETs are idempotent, so transient gateway errors are retried
+    RETRY_TOTAL = 2
+    RETRY_BACKOFF_FACTOR = 0.2
+    RETRY_STATUSES = (502, 503, 504)
+    
+    # Async client pool and default in-flight limit for get_routes_async
+    CONNECTION_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    ASYNC_CONCURRENCY = 32
+    
+    # Raw route cache; keys are coordinates rounded to ~1m
+    ROUTE_CACHE_SIZE = 10_000
+    ROUTE_CACHE_TTL = 600.0  # seconds
+    COORD_PRECISION = 5
+    
+    # Legs that just failed skip OSRM (straight to fallback) for a short while
+    NEGATIVE_CACHE_SIZE = 5000
+    NEGATIVE_CACHE_TTL = 30.0  # seconds
     
     def __init__(
         self, 
         osrm_url: str = None, 
         api_key: str = None,
-        timeout: int = 10
+        timeout: int = 10,
+        hedge_delay_ms: Optional[float] = None,
+        mirror_urls: Optional[List[str]] = None
     ):
         """
         Initialize OSRM Service.
@@ -70,10 +252,79 @@ class OSRMService:
             osrm_url: OSRM server URL (uses public server if not provided)
             api_key: API key for private OSRM servers (optional)
             timeout: Request timeout in seconds
+            hedge_delay_ms: On the async path, send a second (hedged) request
+                if OSRM has not answered within this many ms and use whichever
+                answers first (None = disabled)
+            mirror_urls: Extra OSRM servers that hedged requests rotate through
+                (hedges go to osrm_url itself if none are given)
         """
-        self.osrm_url = osrm_url or os.getenv("OSRM_URL", self.DEFAULT_OSRM_URL)
-        self.api_key = api_key or os.getenv("OSRM_API_KEY")
+        self.osrm_url = osrm_url or _ENV_OSRM_URL or self.DEFAULT_OSRM_URL
+        self.api_key = api_key or _ENV_OSRM_KEY
         self.timeout = timeout
+        
+        # Fixed per instance; calls only append coordinates
+        self._route_prefix = f"{self.osrm_url}/route/v1/driving/"
+        self._hedge_prefixes = [f"{url}/route/v1/driving/" for url in mirror_urls or [self.osrm_url]]
+        self._hedge_count = 0
+        self.hedge_delay = hedge_delay_ms / 1000 if hedge_delay_ms is not None else None
+        self._table_prefix = f"{self.osrm_url}/table/v1/driving/"
+        self._headers = {"Accept-Encoding": _ACCEPT_ENCODING}
+        if self.api_key:
+            self._headers["Authorization"] = f"Bearer {self.api_key}"
+        
+        # Persistent session reuses TCP/TLS connections across lookups
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(
+                total=self.RETRY_TOTAL,
+                backoff_factor=self.RETRY_BACKOFF_FACTOR,
+                status_forcelist=self.RETRY_STATUSES
+            )
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(self._headers)
+        
+        self._aclient: Optional[httpx.AsyncClient] = None  # Created on first async call
+        
+        # Quantized leg -> (stored_at, raw route); LRU ordered, guarded for threaded callers
+        self._route_cache: "OrderedDict[Tuple[float, ...], Tuple[float, Dict]]" = OrderedDict()
+        self._route_cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # Quantized leg -> failed_at, for legs OSRM recently failed to serve
+        self._negative_cache: "OrderedDict[Tuple[float, ...], float]" = OrderedDict()
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the async client, creating it on first use inside the running event loop"""
+        if self._aclient is None or self._aclient.is_closed:
+            self._aclient = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=self.CONNECTION_LIMITS,
+                headers=self._headers
+            )
+        return self._aclient
+    
+    def close(self):
+        """Close pooled connections"""
+        self._session.close()
+    
+    async def aclose(self):
+        """Close sync and async pooled connections"""
+        self.close()
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def get_route(
         self,
@@ -94,53 +345,275 @@ class OSRMService:
         Returns:
             RouteResult with distance, duration, and readable ETA
         """
+        mode = _parse_transport_mode(transport_mode)
         try:
             result = self._call_osrm(start_lat, start_lng, end_lat, end_lng)
+            return self._route_result(result, mode)
             
-            # Apply transport mode adjustment
-            speed_multiplier = self.TRANSPORT_SPEED_MULTIPLIERS.get(transport_mode, 1.0)
-            adjusted_duration = result["duration_minutes"] * speed_multiplier
-            
-            return RouteResult(
-                distance_km=result["distance_km"],
-                duration_minutes=adjusted_duration,
-                eta_readable=self._format_duration(adjusted_duration),
-                source="osrm"
+        except Exception as e:
+            logger.warning(f"OSRM failed, using fallback: {e}")
+            return self._haversine_fallback(
+                start_lat, start_lng, end_lat, end_lng, mode
             )
+    
+    async def get_route_async(
+        self,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float,
+        transport_mode: str = "road"
+    ) -> RouteResult:
+        """Async counterpart of get_route"""
+        mode = _parse_transport_mode(transport_mode)
+        try:
+            result = await self._call_osrm_async(start_lat, start_lng, end_lat, end_lng)
+            return self._route_result(result, mode)
             
         except Exception as e:
             logger.warning(f"OSRM failed, using fallback: {e}")
             return self._haversine_fallback(
-                start_lat, start_lng, end_lat, end_lng, transport_mode
+                start_lat, start_lng, end_lat, end_lng, mode
             )
     
-    def _call_osrm(
-        self, 
-        start_lat: float, 
-        start_lng: float, 
-        end_lat: float, 
-        end_lng: float
-    ) -> Dict:
+    def get_routes(
+        self,
+        legs: List[Tuple[float, float, float, float]],
+        transport_mode: str = "road",
+        max_workers: int = 16
+    ) -> List[RouteResult]:
         """
-        Make OSRM API call.
+        Get routes for many legs from synchronous code.
         
-        OSRM expects coordinates in <lng>,<lat> format!
+        Legs are fetched on a thread pool sharing the pooled session and
+        route cache; use get_routes_async when an event loop is available.
+        
+        Args:
+            legs: List of (start_lat, start_lng, end_lat, end_lng) tuples
+            transport_mode: One of 'road', 'express', 'rail', 'air'
+            max_workers: Worker threads (capped at POOL_MAXSIZE so no thread
+                waits on a pooled connection)
+        
+        Returns:
+            RouteResults in the same order as legs
         """
-        headers = {}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
+        if len(legs) <= 1:
+            return [self.get_route(*leg, transport_mode) for leg in legs]
         
-        # OSRM format: /route/v1/driving/{lng},{lat};{lng},{lat}
-        url = (
-            f"{self.osrm_url}/route/v1/driving/"
-            f"{start_lng},{start_lat};{end_lng},{end_lat}"
-            f"?overview=false"
+        workers = min(max_workers, self.POOL_MAXSIZE, len(legs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda leg: self.get_route(*leg, transport_mode), legs))
+    
+    async def get_routes_async(
+        self,
+        legs: List[Tuple[float, float, float, float]],
+        transport_mode: str = "road",
+        concurrency: int = None
+    ) -> List[RouteResult]:
+        """
+        Get routes for many legs concurrently.
+        
+        Requests overlap on the pooled async client, so a batch takes about
+        as long as its slowest leg rather than the sum of all legs.
+        
+        Args:
+            legs: List of (start_lat, start_lng, end_lat, end_lng) tuples
+            transport_mode: One of 'road', 'express', 'rail', 'air'
+            concurrency: Maximum requests in flight (default ASYNC_CONCURRENCY)
+        
+        Returns:
+            RouteResults in the same order as legs
+        """
+        mode = _parse_transport_mode(transport_mode)
+        results = await self._gather_osrm(legs, concurrency)
+        
+        routes = []
+        for leg, result in zip(legs, results):
+            if isinstance(result, Exception):
+                logger.warning(f"OSRM failed, using fallback: {result}")
+                routes.append(self._haversine_fallback(*leg, mode))
+            else:
+                routes.append(self._route_result(result, mode))
+        return routes
+    
+    async def get_route_batch(
+        self,
+        start_lat: np.ndarray,
+        start_lng: np.ndarray,
+        end_lat: np.ndarray,
+        end_lng: np.ndarray,
+        transport_mode: str = "road",
+        use_osrm: bool = True,
+        concurrency: int = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get routes for many legs given as coordinate arrays (struct-of-arrays).
+        
+        Legs OSRM cannot serve are filled in with one vectorized haversine
+        pass instead of per-leg fallbacks.
+        
+        Args:
+            start_lat, start_lng: (N,) origin coordinate arrays
+            end_lat, end_lng: (N,) destination coordinate arrays
+            transport_mode: One of 'road', 'express', 'rail', 'air'
+            use_osrm: Query OSRM (False = haversine estimate for every leg)
+            concurrency: Maximum OSRM requests in flight (default ASYNC_CONCURRENCY)
+        
+        Returns:
+            Dict of (N,) arrays: float32 distance_km and duration_minutes, and
+            from_osrm (True where the leg came from OSRM)
+        """
+        lat1, lng1, lat2, lng2 = (
+            np.asarray(a, dtype=np.float64) for a in (start_lat, start_lng, end_lat, end_lng)
         )
+        if any(a.ndim != 1 for a in (lat1, lng1, lat2, lng2)) or not (
+            lat1.shape == lng1.shape == lat2.shape == lng2.shape
+        ):
+            raise ValueError("start_lat, start_lng, end_lat and end_lng must be 1-D arrays of equal length")
         
-        response = requests.get(url, headers=headers, timeout=self.timeout)
-        response.raise_for_status()
-        data = response.json()
+        mode = _parse_transport_mode(transport_mode)
+        n = lat1.shape[0]
+        from_osrm = np.zeros(n, dtype=bool)
+        distance_km = np.empty(n, dtype=np.float32)
+        duration_minutes = np.empty(n, dtype=np.float32)
+        
+        if use_osrm and n:
+            legs = list(zip(lat1.tolist(), lng1.tolist(), lat2.tolist(), lng2.tolist()))
+            results = await self._gather_osrm(legs, concurrency)
+            
+            speed_multiplier = _SPEED_MULTIPLIERS[mode]
+            for i, result in enumerate(results):
+                if not isinstance(result, Exception):
+                    from_osrm[i] = True
+                    distance_km[i] = result["distance_km"]
+                    duration_minutes[i] = result["duration_minutes"] * speed_multiplier
+            
+            failed = n - int(from_osrm.sum())
+            if failed:
+                logger.warning(f"OSRM failed for {failed}/{n} legs, using fallback")
+        
+        missing = ~from_osrm
+        if missing.any():
+            distance_km[missing], duration_minutes[missing] = self._haversine_soa(
+                lat1[missing], lng1[missing], lat2[missing], lng2[missing], mode
+            )
+        
+        return {
+            "distance_km": distance_km,
+            "duration_minutes": duration_minutes,
+            "from_osrm": from_osrm
+        }
+    
+    async def _gather_osrm(
+        self,
+        legs: List[Tuple[float, float, float, float]],
+        concurrency: int = None
+    ) -> List:
+        """Run _call_osrm_async for every leg under a concurrency cap (exceptions returned in place)"""
+        semaphore = asyncio.Semaphore(concurrency or self.ASYNC_CONCURRENCY)
+        
+        async def _one(leg: Tuple[float, float, float, float]) -> Dict:
+            async with semaphore:
+                return await self._call_osrm_async(*leg)
         
+        return await asyncio.gather(*[_one(leg) for leg in legs], return_exceptions=True)
+    
+    def _route_result(self, result: Dict, mode: TransportMode) -> RouteResult:
+        """Build a RouteResult from a raw OSRM leg, applying the transport mode adjustment"""
+        adjusted_duration = result["duration_minutes"] * _SPEED_MULTIPLIERS[mode]
+        
+        return RouteResult(
+            distance_km=result["distance_km"],
+            duration_minutes=adjusted_duration,
+            source="osrm"
+        )
+    
+    def _cache_key(
+        self,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float
+    ) -> Tuple[float, ...]:
+        """Quantize a leg so near-identical lookups share a cache entry"""
+        p = self.COORD_PRECISION
+        return (round(start_lat, p), round(start_lng, p), round(end_lat, p), round(end_lng, p))
+    
+    def _cache_get(self, key: Tuple[float, ...]) -> Optional[Dict]:
+        """Return a cached raw route if present and not expired"""
+        with self._route_cache_lock:
+            entry = self._route_cache.get(key)
+            if entry is not None:
+                stored_at, route = entry
+                if time.monotonic() - stored_at <= self.ROUTE_CACHE_TTL:
+                    self._route_cache.move_to_end(key)
+                    self._cache_hits += 1
+                    return route
+                del self._route_cache[key]
+            self._cache_misses += 1
+            return None
+    
+    def _cache_put(self, key: Tuple[float, ...], route: Dict):
+        """Store a raw route, evicting the least recently used entry when full"""
+        with self._route_cache_lock:
+            self._route_cache[key] = (time.monotonic(), route)
+            self._route_cache.move_to_end(key)
+            if len(self._route_cache) > self.ROUTE_CACHE_SIZE:
+                self._route_cache.popitem(last=False)
+    
+    def _negative_hit(self, key: Tuple[float, ...]) -> bool:
+        """Check whether OSRM failed for this leg within NEGATIVE_CACHE_TTL"""
+        with self._route_cache_lock:
+            failed_at = self._negative_cache.get(key)
+            if failed_at is None:
+                return False
+            if time.monotonic() - failed_at <= self.NEGATIVE_CACHE_TTL:
+                return True
+            del self._negative_cache[key]
+            return False
+    
+    def _negative_put(self, key: Tuple[float, ...]):
+        """Record an OSRM failure for this leg"""
+        with self._route_cache_lock:
+            self._negative_cache[key] = time.monotonic()
+            self._negative_cache.move_to_end(key)
+            if len(self._negative_cache) > self.NEGATIVE_CACHE_SIZE:
+                self._negative_cache.popitem(last=False)
+    
+    def clear_negative_cache(self):
+        """Forget recorded OSRM failures (e.g. once the server is back)"""
+        with self._route_cache_lock:
+            self._negative_cache.clear()
+    
+    def cache_stats(self) -> Dict:
+        """Route cache hit/miss counters and current size"""
+        with self._route_cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._route_cache),
+                "negative_size": len(self._negative_cache)
+            }
+    
+    def _route_url(
+        self,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float,
+        prefix: str = None
+    ) -> str:
+        """
+        Build the OSRM route URL.
+        
+        OSRM expects coordinates in <lng>,<lat> format!
+        """
+        # OSRM format: /route/v1/driving/{lng},{lat};{lng},{lat}
+        return f"{prefix or self._route_prefix}{start_lng},{start_lat};{end_lng},{end_lat}?overview=false"
+    
+    @staticmethod
+    def _parse_route(data: Dict) -> Dict:
+        """Extract distance and duration from an OSRM route response"""
         if data.get("code") != "Ok":
             raise ValueError(f"OSRM error: {data.get('message', 'Unknown error')}")
         
@@ -151,72 +624,255 @@ class OSRMService:
             "duration_minutes": route["duration"] / 60
         }
     
+    def _call_osrm(
+        self, 
+        start_lat: float, 
+        start_lng: float, 
+        end_lat: float, 
+        end_lng: float
+    ) -> Dict:
+        """Make OSRM API call (served from the route cache when possible)"""
+        key = self._cache_key(start_lat, start_lng, end_lat, end_lng)
+        route = self._cache_get(key)
+        if route is not None:
+            return route
+        if self._negative_hit(key):
+            raise RuntimeError("OSRM failed for this leg recently; skipping request")
+        
+        url = self._route_url(start_lat, start_lng, end_lat, end_lng)
+        
+        try:
+            response = self._session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            route = self._parse_route(_json_loads(response.content))
+        except Exception:
+            self._negative_put(key)
+            raise
+        self._cache_put(key, route)
+        return route
+    
+    async def _call_osrm_async(
+        self,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float
+    ) -> Dict:
+        """Async counterpart of _call_osrm"""
+        key = self._cache_key(start_lat, start_lng, end_lat, end_lng)
+        route = self._cache_get(key)
+        if route is not None:
+            return route
+        if self._negative_hit(key):
+            raise RuntimeError("OSRM failed for this leg recently; skipping request")
+        
+        url = self._route_url(start_lat, start_lng, end_lat, end_lng)
+        
+        try:
+            if self.hedge_delay is None:
+                route = await self._fetch_route_async(url)
+            else:
+                prefix = self._hedge_prefixes[self._hedge_count % len(self._hedge_prefixes)]
+                self._hedge_count += 1
+                route = await self._fetch_hedged_async(
+                    url, self._route_url(start_lat, start_lng, end_lat, end_lng, prefix)
+                )
+        except Exception:
+            self._negative_put(key)
+            raise
+        self._cache_put(key, route)
+        return route
+    
+    async def _fetch_route_async(self, url: str) -> Dict:
+        """GET and parse one OSRM route URL"""
+        response = await self._get_async_client().get(url)
+        response.raise_for_status()
+        return self._parse_route(_json_loads(response.content))
+    
+    async def _fetch_hedged_async(self, url: str, hedge_url: str) -> Dict:
+        """
+        Fetch url, racing hedge_url if no answer arrives within hedge_delay.
+        
+        The first successful response wins and the other request is
+        cancelled; an error is raised only if every request sent failed.
+        """
+        pending = {asyncio.ensure_future(self._fetch_route_async(url))}
+        error = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay)
+            if not done:
+                pending.add(asyncio.ensure_future(self._fetch_route_async(hedge_url)))
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+    
     def _haversine_fallback(
         self,
         start_lat: float,
         start_lng: float,
         end_lat: float,
         end_lng: float,
-        transport_mode: str
+        mode: TransportMode
     ) -> RouteResult:
         """
         Fallback calculation using Haversine distance with estimated road factor.
         """
-        import math
+        sin = math.sin
+        cos = math.cos
+        radians = math.radians
         
         # Haversine formula
-        lat1_rad = math.radians(start_lat)
-        lon1_rad = math.radians(start_lng)
-        lat2_rad = math.radians(end_lat)
-        lon2_rad = math.radians(end_lng)
-        
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
+        lat1_rad = radians(start_lat)
+        lat2_rad = radians(end_lat)
+        s_dlat = sin((lat2_rad - lat1_rad) * 0.5)
+        s_dlon = sin(radians(end_lng - start_lng) * 0.5)
         
-        # Earth's radius
-        straight_distance = 6371 * c
-        
-        # Road distance is typically 1.3x straight-line distance
-        road_distance = straight_distance * 1.3
+        a = s_dlat * s_dlat + cos(lat1_rad) * cos(lat2_rad) * s_dlon * s_dlon
+        road_distance = _ROAD_DIAMETER_KM * math.asin(math.sqrt(a))
         
         # Estimate duration based on average speed
-        # India average: 40 km/h for road transport
-        base_speeds = {
-            "road": 40,
-            "express": 60,
-            "rail": 80,
-            "air": 500
-        }
-        speed = base_speeds.get(transport_mode, 40)
-        duration_hours = road_distance / speed
+        duration_hours = road_distance / _FALLBACK_SPEEDS_KMH[mode]
         duration_minutes = duration_hours * 60
         
         return RouteResult(
             distance_km=road_distance,
             duration_minutes=duration_minutes,
-            eta_readable=self._format_duration(duration_minutes),
             source="haversine_fallback"
         )
     
-    def _format_duration(self, minutes: float) -> str:
-        """Format duration in human-readable format"""
-        if minutes < 60:
-            return f"{int(minutes)} min"
+    def _haversine_fallback_batch(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        mode: TransportMode = TransportMode.ROAD
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized haversine fallback for many legs at once.
         
-        hours = int(minutes // 60)
-        mins = int(minutes % 60)
+        Use _haversine_fallback for single legs; scalar math is faster there.
         
-        if hours >= 24:
-            days = hours // 24
-            hours = hours % 24
-            if hours > 0:
-                return f"{days}d {hours}h {mins}m"
-            return f"{days}d {mins}m"
+        Args:
+            starts: (N, 2) array of origin (lat, lng) pairs
+            ends: (N, 2) array of destination (lat, lng) pairs
+            mode: Transport mode
         
-        return f"{hours}h {mins}m"
+        Returns:
+            (distance_km, duration_minutes) float32 arrays of shape (N,)
+        """
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        return self._haversine_soa(starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1], mode)
+    
+    def _haversine_soa(
+        self,
+        start_lat: np.ndarray,
+        start_lng: np.ndarray,
+        end_lat: np.ndarray,
+        end_lng: np.ndarray,
+        mode: TransportMode = TransportMode.ROAD
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized haversine fallback over (N,) coordinate arrays.
+        
+        Computed in float64 and returned as float32; the rounding error is far
+        below a metre at these distances.
+        
+        Returns:
+            (distance_km, duration_minutes) float32 arrays of shape (N,)
+        """
+        lat1 = np.radians(start_lat)
+        lon1 = np.radians(start_lng)
+        lat2 = np.radians(end_lat)
+        lon2 = np.radians(end_lng)
+        
+        kernels = _get_haversine_kernels() if lat1.shape[0] >= self.NUMBA_MIN_BATCH else None
+        if kernels is not None:
+            road_distance = np.empty(lat1.shape[0], dtype=np.float64)
+            kernels[0](lat1, lon1, lat2, lon2, road_distance)
+        else:
+            a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+            road_distance = _ROAD_DIAMETER_KM * np.arcsin(np.sqrt(a))
+        
+        duration_minutes = road_distance * (60.0 / _FALLBACK_SPEEDS_KMH[mode])
+        
+        return road_distance.astype(np.float32, copy=False), duration_minutes.astype(np.float32, copy=False)
+    
+    def _haversine_matrix(
+        self,
+        origins: np.ndarray,
+        destinations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Estimated road distance (km) from every origin to every destination.
+        
+        Args:
+            origins: (N, 2) array of (lat, lng) pairs
+            destinations: (M, 2) array of (lat, lng) pairs
+        
+        Returns:
+            (N, M) float32 distance matrix
+        """
+        origins = np.radians(np.asarray(origins, dtype=np.float64).reshape(-1, 2))
+        destinations = np.radians(np.asarray(destinations, dtype=np.float64).reshape(-1, 2))
+        lat1, lon1 = origins[:, 0], origins[:, 1]
+        lat2, lon2 = destinations[:, 0], destinations[:, 1]
+        
+        out = np.empty((len(origins), len(destinations)), dtype=np.float32)
+        kernels = _get_haversine_kernels() if out.size >= self.NUMBA_MIN_BATCH else None
+        if kernels is not None:
+            kernels[1](
+                np.ascontiguousarray(lat1), np.ascontiguousarray(lon1),
+                np.ascontiguousarray(lat2), np.ascontiguousarray(lon2),
+                out
+            )
+        else:
+            lat1, lon1 = lat1[:, None], lon1[:, None]
+            a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+            out[:] = _ROAD_DIAMETER_KM * np.arcsin(np.sqrt(a))
+        return out
+    
+    _format_duration = staticmethod(_format_duration)
+    
+    def _table_tile(
+        self,
+        origins: np.ndarray,
+        destinations: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, list, list]:
+        """
+        Request one OSRM table tile.
+        
+        Returns:
+            (distances_m, durations_s, sources, destinations) for the tile
+        """
+        n_origins = len(origins)
+        coords_str = _fmt_coords(np.concatenate((origins, destinations)).tolist())
+        
+        sources_indices = ";".join(map(str, range(n_origins)))
+        dest_indices = ";".join(map(str, range(n_origins, n_origins + len(destinations))))
+        
+        url = f"{self._table_prefix}{coords_str}?sources={sources_indices}&destinations={dest_indices}&annotations=distance,duration"
+        
+        response = self._session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        data = _json_loads(response.content)
+        
+        if data.get("code") != "Ok":
+            raise ValueError(f"OSRM error: {data.get('message')}")
+        
+        return (
+            np.asarray(data["distances"], dtype=np.float32),
+            np.asarray(data["durations"], dtype=np.float32),
+            data.get("sources", []),
+            data.get("destinations", [])
+        )
     
     def get_distance_matrix(
         self, 
@@ -226,46 +882,89 @@ class OSRMService:
         """
         Get distance matrix between multiple origins and destinations.
         
+        Large matrices are split into MATRIX_TILE_SIZE x MATRIX_TILE_SIZE
+        tiles requested concurrently; a tile OSRM cannot serve is filled
+        from the haversine estimate instead.
+        
         Args:
             origins: List of (lat, lng) tuples
             destinations: List of (lat, lng) tuples
         
         Returns:
-            Matrix of distances and durations
+            Dict with (N, M) float32 "distances" (meters) and "durations"
+            (seconds) arrays; float32 keeps them within 1 m and 0.1 s
         """
-        # Build OSRM table request
-        coords = origins + destinations
-        coords_str = ";".join([f"{lng},{lat}" for lat, lng in coords])
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        destinations = np.asarray(destinations, dtype=np.float64).reshape(-1, 2)
+        n, m = len(origins), len(destinations)
         
-        sources_indices = ";".join([str(i) for i in range(len(origins))])
-        dest_indices = ";".join([str(i) for i in range(len(origins), len(coords))])
+        distances = np.empty((n, m), dtype=np.float32)
+        durations = np.empty((n, m), dtype=np.float32)
         
-        url = (
-            f"{self.osrm_url}/table/v1/driving/{coords_str}"
-            f"?sources={sources_indices}&destinations={dest_indices}"
-        )
+        tile = self.MATRIX_TILE_SIZE
+        tiles = [
+            (slice(i, i + tile), slice(j, j + tile))
+            for i in range(0, n, tile)
+            for j in range(0, m, tile)
+        ]
         
-        headers = {}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
+        def fetch(rows: slice, cols: slice):
+            try:
+                return self._table_tile(origins[rows], destinations[cols])
+            except Exception as e:
+                return e
         
-        try:
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("code") != "Ok":
-                raise ValueError(f"OSRM error: {data.get('message')}")
-            
-            return {
-                "durations": data["durations"],  # Matrix in seconds
-                "sources": data.get("sources", []),
-                "destinations": data.get("destinations", [])
-            }
-            
-        except Exception as e:
-            logger.warning(f"OSRM matrix failed: {e}")
-            return {"error": str(e)}
+        if len(tiles) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(tiles), self.ASYNC_CONCURRENCY)) as pool:
+                results = list(pool.map(lambda t: fetch(*t), tiles))
+        else:
+            results = [fetch(*t) for t in tiles]
+        
+        seconds_per_km = 3600.0 / _FALLBACK_SPEEDS_KMH[TransportMode.ROAD]
+        sources, dests = [], []
+        errors = []
+        for (rows, cols), result in zip(tiles, results):
+            if isinstance(result, Exception):
+                errors.append(result)
+                km = self._haversine_matrix(origins[rows], destinations[cols])
+                distances[rows, cols] = km * 1000
+                durations[rows, cols] = km * seconds_per_km
+                continue
+            distances[rows, cols], durations[rows, cols], tile_sources, tile_dests = result
+            if cols.start == 0:
+                sources.extend(tile_sources)
+            if rows.start == 0:
+                dests.extend(tile_dests)
+        
+        if not errors:
+            source = "osrm"
+        elif len(errors) == len(tiles):
+            source = "haversine_fallback"
+        else:
+            source = "mixed"
+        
+        matrix = {
+            "distances": distances,  # Matrix in meters
+            "durations": durations,  # Matrix in seconds
+            "sources": sources,
+            "destinations": dests,
+            "source": source
+        }
+        if errors:
+            logger.warning(f"OSRM matrix failed for {len(errors)}/{len(tiles)} tiles, using fallback: {errors[0]}")
+            matrix["error"] = str(errors[0])
+        return matrix
+
+
+_default_service: Optional[OSRMService] = None
+
+
+def get_osrm_service() -> OSRMService:
+    """Get the shared OSRM service configured from the environment"""
+    global _default_service
+    if _default_service is None:
+        _default_service = OSRMService()
+    return _default_service
 
 
 # Convenience function for simple usage
@@ -284,6 +983,10 @@ def get_eta_osrm(
     Returns:
         Dict with distance_km, eta_minutes, eta_readable, source
     """
-    service = OSRMService(osrm_url=osrm_url, api_key=api_key)
-    result = service.get_route(start_lat, start_lng, end_lat, end_lng, transport_mode)
+    if osrm_url or api_key:
+        # One-off server settings: close the pooled session when done
+        with OSRMService(osrm_url=osrm_url, api_key=api_key) as service:
+            result = service.get_route(start_lat, start_lng, end_lat, end_lng, transport_mode)
+    else:
+        result = get_osrm_service().get_route(start_lat, start_lng, end_lat, end_lng, transport_mode)
     return result.to_dict()
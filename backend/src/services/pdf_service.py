@@ -13,9 +13,14 @@ import os
 import io
 import base64
 import logging
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, Mapping, Sequence, Union
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from string import Template
 
 # IST Timezone (UTC+5:30)
 IST = timezone(timedelta(hours=5, minutes=30))
@@ -33,25 +38,80 @@ def to_ist(dt: datetime) -> datetime:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(IST)
 
+
+@lru_cache(maxsize=512)
+def _format_history_date(date_str: str) -> str:
+    """Format an ISO history date as '05 Jan 2025'; unparseable values pass through"""
+    if not date_str or date_str == "N/A":
+        return date_str
+    try:
+        return datetime.fromisoformat(date_str.replace("Z", "+00:00")).strftime("%d %b %Y")
+    except (AttributeError, TypeError, ValueError):
+        return date_str
+
+
+def _truncate_remarks(remarks: Optional[str]) -> str:
+    """Clip history remarks to 40 characters for the table"""
+    remarks = remarks or ""
+    return remarks[:40] + "..." if len(remarks) > 40 else remarks
+
+try:
+    import reportlab  # noqa: F401 - submodules are imported on first use, see _load_reportlab
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
 try:
+    from pybase64 import b64encode_as_string
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _load_reportlab():
+    """
+    Import the ReportLab names used below into this module.
+    
+    Deferred until a PDFService is created, so importing the services
+    package does not pay for reportlab.platypus (~70ms cold).
+    """
+    global colors, A4, getSampleStyleSheet, ParagraphStyle, mm
+    global SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
+    global TA_CENTER, TA_JUSTIFY
+    from reportlab import rl_config
     from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4, letter
+    from reportlab.lib.pagesizes import A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch, mm
+    from reportlab.lib.units import mm
     from reportlab.platypus import (
-        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-        Image, PageBreak, HRFlowable
+        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
     )
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    
+    # Per-attribute validation on graphics shapes is a debugging aid; keep it only when asked for
+    if os.getenv("NEXUS_PDF_DEBUG") != "1":
+        rl_config.shapeChecking = 0
 
-from dotenv import load_dotenv
 
-load_dotenv(override=True)
+@lru_cache(maxsize=128)
+def _hex(value: str):
+    """Parse a hex colour once; repeated colours share one Color instance"""
+    return colors.HexColor(value)
 
-logger = logging.getLogger(__name__)
+
+class ReportSeverity(IntEnum):
+    """Report severity; values index the per-severity banner tuples on PDFService"""
+    RED = 0
+    AMBER = 1
+    GREEN = 2
+    UNKNOWN = 3
+    
+    @classmethod
+    def parse(cls, severity: str) -> "ReportSeverity":
+        """Map a severity name ("RED", "AMBER", "GREEN") to its member; anything else is UNKNOWN"""
+        return cls.__members__.get(severity, cls.UNKNOWN)
 
 
 @dataclass
@@ -80,11 +140,11 @@ class ReportContent:
     daily_demand: float
     
     # Status
-    severity: str  # RED, AMBER, GREEN
+    severity: Union[str, ReportSeverity]  # RED, AMBER, GREEN; names are normalized to ReportSeverity
     alert_type: str  # understock, overstock, ok
     
-    # History
-    history: List[Dict[str, Any]]
+    # History: one dict per transaction, or columns {"date": [...], "type": [...], "quantity": [...], "remarks": [...]}
+    history: Union[List[Dict[str, Any]], Mapping[str, Sequence]]
     
     # LLM content
     summary: str
@@ -94,6 +154,25 @@ class ReportContent:
     # Meta
     generated_at: datetime = None
     report_id: str = None
+    include_footer: bool = True  # False keeps only the closing rule
+    severity_label: str = field(init=False, repr=False)  # Severity as given, for text output
+    
+    def __post_init__(self):
+        self.severity_label = getattr(self.severity, "name", self.severity)
+        if not isinstance(self.severity, ReportSeverity):
+            self.severity = ReportSeverity.parse(self.severity)
+
+
+def _banner_table_style(background, text_color) -> "TableStyle":
+    """Table style for the full-width severity banner"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), background),
+        ('TEXTCOLOR', (0, 0), (-1, -1), text_color),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('PADDING', (0, 0), (-1, -1), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ])
 
 
 class PDFService:
@@ -119,18 +198,59 @@ class PDFService:
         service.save_report(content, "/path/to/report.pdf")
     """
     
-    # Brand colors for POWERGRID
-    BRAND_PRIMARY = colors.HexColor("#1E3A5F")  # Navy blue
-    BRAND_SECONDARY = colors.HexColor("#2E7D32")  # Green
-    BRAND_ACCENT = colors.HexColor("#FFA000")  # Amber
-    BRAND_DANGER = colors.HexColor("#C62828")  # Red
+    # Brand and severity colours, set up with the rest of the ReportLab state by _init_reportlab
+    BRAND_PRIMARY = None  # Navy blue
+    BRAND_SECONDARY = None  # Green
+    BRAND_ACCENT = None  # Amber
+    BRAND_DANGER = None  # Red
+    SEVERITY_COLORS: Dict[str, Any] = {}
+    
+    # Alert banner per ReportSeverity: text, paragraph style name, table style
+    _SEVERITY_BANNER_TEXT = (
+        "🔴 CRITICAL ALERT - Immediate Action Required",
+        "🟡 WARNING - Attention Needed",
+        "🟢 STATUS OK - All Systems Normal",
+        "INVENTORY ALERT"
+    )
+    _SEVERITY_BANNER_STYLE = ("alert_red", "alert_amber", "alert_green", "body")
+    _SEVERITY_BANNER_TABLE_STYLES: tuple = ()
+    
+    # Constant table styles shared by every report (built by _init_reportlab)
+    _INFO_TABLE_STYLE = None
+    _METRICS_TABLE_STYLE = None
+    _STATUS_TABLE_STYLE = None
+    _HISTORY_TABLE_STYLE = None
+    
+    # Metric card colours, low to high risk, picked by bisecting the thresholds below:
+    # UTR/OTR go amber above 0.2 and red above 0.5; PAR goes amber below 0.6 and red below 0.3
+    _RATIO_COLORS = ("#2E7D32", "#FFA000", "#C62828")
+    _RATIO_THRESHOLDS = (0.2, 0.5)
+    _PAR_THRESHOLDS = (0.3, 0.6)
+    
+    # Metric card markup: grey label over the bold, coloured value
+    _METRIC_TMPL = "<font color='grey'>{}</font><br/><font color='{}'><b>{}</b></font>"
+    
+    # Concurrent file writes in save_reports_batch
+    SAVE_WRITE_WORKERS = 8
+    
+    # Most recent transactions shown in the history table
+    HISTORY_MAX_ROWS = 10
+    _HISTORY_HEADER = ("Date", "Type", "Quantity", "Remarks")
+    
+    # Footer markup, free of source indentation so the paragraph parser has less to tokenize
+    _FOOTER_TEMPLATE = Template(
+        '<font size="8" color="grey">'
+        'This report was automatically generated by NEXUS Inventory Management System.<br/>'
+        'Report ID: ${report_id}<br/>'
+        'Generated: ${generated}<br/>'
+        '<br/>'
+        'POWERGRID Corporation of India Limited<br/>'
+        'For queries, contact: inventory-support@powergrid.in'
+        '</font>'
+    )
     
-    # Severity colors
-    SEVERITY_COLORS = {
-        "RED": colors.HexColor("#C62828"),
-        "AMBER": colors.HexColor("#FFA000"),
-        "GREEN": colors.HexColor("#2E7D32")
-    }
+    # Paragraph styles are identical for every instance; built once per process
+    _STYLES: Optional[Dict[str, "ParagraphStyle"]] = None
     
     def __init__(self, output_dir: str = None):
         """
@@ -146,12 +266,90 @@ class PDFService:
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
             "data", "outputs", "reports"
         )
-        os.makedirs(self.output_dir, exist_ok=True)
+        self._output_dir_ready = False  # Created on the first save into it
+        
+        # Initialize styles (unused by the plain-text fallback)
+        if REPORTLAB_AVAILABLE:
+            self._init_reportlab()
+            self.styles = self._STYLES
+        else:
+            self.styles = {}
+    
+    @classmethod
+    def _init_reportlab(cls):
+        """Import ReportLab and build the shared colours and styles, once per process"""
+        if cls._STYLES is not None:
+            return
+        _load_reportlab()
+        
+        cls.BRAND_PRIMARY = _hex("#1E3A5F")
+        cls.BRAND_SECONDARY = _hex("#2E7D32")
+        cls.BRAND_ACCENT = _hex("#FFA000")
+        cls.BRAND_DANGER = _hex("#C62828")
+        cls.SEVERITY_COLORS = {
+            "RED": cls.BRAND_DANGER,
+            "AMBER": cls.BRAND_ACCENT,
+            "GREEN": cls.BRAND_SECONDARY
+        }
+        
+        cls._SEVERITY_BANNER_TABLE_STYLES = (
+            _banner_table_style(cls.BRAND_DANGER, colors.white),
+            _banner_table_style(cls.BRAND_ACCENT, colors.black),
+            _banner_table_style(cls.BRAND_SECONDARY, colors.white),
+            _banner_table_style(colors.grey, colors.white)
+        )
+        
+        # Constant table styling, shared by every report
+        cls._INFO_TABLE_STYLE = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('LEADING', (0, 0), (-1, -1), 14),
+        ])
+        
+        cls._METRICS_TABLE_STYLE = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), _hex("#F5F5F5")),
+            ('BOX', (0, 0), (-1, -1), 1, _hex("#E0E0E0")),
+            ('INNERGRID', (0, 0), (-1, -1), 0.5, _hex("#E0E0E0")),
+            ('PADDING', (0, 0), (-1, -1), 10),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
         
-        # Initialize styles
-        self.styles = self._create_styles()
+        # The status cell's background is layered on per report
+        cls._STATUS_TABLE_STYLE = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), cls.BRAND_PRIMARY),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('PADDING', (0, 0), (-1, -1), 10),
+            ('TEXTCOLOR', (3, 1), (3, 1), colors.white),
+            ('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold'),
+            ('BOX', (0, 0), (-1, -1), 1, cls.BRAND_PRIMARY),
+            ('INNERGRID', (0, 0), (-1, -1), 0.5, _hex("#E0E0E0")),
+        ])
+        
+        cls._HISTORY_TABLE_STYLE = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), cls.BRAND_PRIMARY),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('ALIGN', (2, 1), (2, -1), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('PADDING', (0, 0), (-1, -1), 6),
+            ('BOX', (0, 0), (-1, -1), 1, cls.BRAND_PRIMARY),
+            ('INNERGRID', (0, 0), (-1, -1), 0.5, _hex("#E0E0E0")),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _hex("#F8F8F8")])
+        ])
+        
+        cls._STYLES = cls._create_styles()
     
-    def _create_styles(self) -> Dict[str, ParagraphStyle]:
+    @classmethod
+    def _create_styles(cls) -> Dict[str, "ParagraphStyle"]:
         """Create custom paragraph styles"""
         if not REPORTLAB_AVAILABLE:
             return {}
@@ -163,7 +361,7 @@ class PDFService:
                 "CustomTitle",
                 parent=base_styles["Heading1"],
                 fontSize=24,
-                textColor=self.BRAND_PRIMARY,
+                textColor=cls.BRAND_PRIMARY,
                 spaceAfter=12,
                 alignment=TA_CENTER
             ),
@@ -179,7 +377,7 @@ class PDFService:
                 "CustomHeading",
                 parent=base_styles["Heading2"],
                 fontSize=14,
-                textColor=self.BRAND_PRIMARY,
+                textColor=cls.BRAND_PRIMARY,
                 spaceBefore=16,
                 spaceAfter=8,
                 borderPadding=4
@@ -188,7 +386,7 @@ class PDFService:
                 "CustomSubheading",
                 parent=base_styles["Heading3"],
                 fontSize=12,
-                textColor=self.BRAND_PRIMARY,
+                textColor=cls.BRAND_PRIMARY,
                 spaceBefore=10,
                 spaceAfter=6
             ),
@@ -218,7 +416,7 @@ class PDFService:
                 parent=base_styles["Normal"],
                 fontSize=12,
                 textColor=colors.white,
-                backColor=self.BRAND_DANGER,
+                backColor=cls.BRAND_DANGER,
                 alignment=TA_CENTER,
                 borderPadding=8
             ),
@@ -227,7 +425,7 @@ class PDFService:
                 parent=base_styles["Normal"],
                 fontSize=12,
                 textColor=colors.black,
-                backColor=self.BRAND_ACCENT,
+                backColor=cls.BRAND_ACCENT,
                 alignment=TA_CENTER,
                 borderPadding=8
             ),
@@ -236,7 +434,7 @@ class PDFService:
                 parent=base_styles["Normal"],
                 fontSize=12,
                 textColor=colors.white,
-                backColor=self.BRAND_SECONDARY,
+                backColor=cls.BRAND_SECONDARY,
                 alignment=TA_CENTER,
                 borderPadding=8
             ),
@@ -251,7 +449,7 @@ class PDFService:
                 parent=base_styles["Normal"],
                 fontSize=14,
                 fontName="Helvetica-Bold",
-                textColor=self.BRAND_PRIMARY
+                textColor=cls.BRAND_PRIMARY
             )
         }
         
@@ -271,8 +469,31 @@ class PDFService:
             return self._generate_fallback_report(content)
         
         buffer = io.BytesIO()
+        self.generate_report_to(content, buffer)
+        
+        pdf_bytes = buffer.getvalue()
+        buffer.close()
+        
+        logger.info(f"Generated PDF report: {len(pdf_bytes)} bytes")
+        return pdf_bytes
+    
+    def generate_report_to(self, content: ReportContent, fileobj) -> None:
+        """
+        Generate PDF report straight into a writable binary file object.
+        
+        Avoids holding the finished document in memory when the caller can
+        consume it directly (a file, a spooled temp file, a response body).
+        
+        Args:
+            content: ReportContent with all report data
+            fileobj: Binary file-like object; left open for the caller
+        """
+        if not REPORTLAB_AVAILABLE:
+            fileobj.write(self._generate_fallback_report(content))
+            return
+        
         doc = SimpleDocTemplate(
-            buffer,
+            fileobj,
             pagesize=A4,
             rightMargin=20*mm,
             leftMargin=20*mm,
@@ -280,41 +501,65 @@ class PDFService:
             bottomMargin=20*mm
         )
         
+        # One timestamp for the whole report
+        generated_at = content.generated_at or get_ist_now()
+        
         # Build document elements
         elements = []
         
         # Header
-        elements.extend(self._build_header(content))
+        self._build_header(content, elements)
         
         # Alert banner
-        elements.extend(self._build_alert_banner(content))
+        self._build_alert_banner(content, elements)
         
         # Material and Location info
-        elements.extend(self._build_info_section(content))
+        self._build_info_section(content, generated_at, elements)
         
         # Metrics section
-        elements.extend(self._build_metrics_section(content))
+        self._build_metrics_section(content, elements)
         
         # Stock status
-        elements.extend(self._build_stock_status(content))
+        self._build_stock_status(content, elements)
         
         # Summary and recommendations
-        elements.extend(self._build_analysis_section(content))
+        self._build_analysis_section(content, elements)
         
         # Transaction history
-        elements.extend(self._build_history_section(content))
+        self._build_history_section(content, elements)
         
         # Footer
-        elements.extend(self._build_footer(content))
+        self._build_footer(content, generated_at, elements)
         
         # Build PDF
         doc.build(elements)
+    
+    @classmethod
+    def generate_reports_batch(
+        cls,
+        contents: List[ReportContent],
+        max_workers: int = None
+    ) -> List[bytes]:
+        """
+        Generate many PDF reports in parallel worker processes.
         
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
+        Rendering is CPU-bound pure Python, so threads would serialize on
+        the GIL; each worker process renders with its own shared service.
         
-        logger.info(f"Generated PDF report: {len(pdf_bytes)} bytes")
-        return pdf_bytes
+        Args:
+            contents: ReportContent for each report
+            max_workers: Worker processes (default: CPU count)
+            
+        Returns:
+            PDF documents as bytes, in the same order as contents
+        """
+        workers = min(max_workers or os.cpu_count() or 1, len(contents))
+        if workers <= 1:
+            service = get_pdf_service()
+            return [service.generate_report(content) for content in contents]
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_render_report, contents))
     
     def generate_report_base64(self, content: ReportContent) -> str:
         """
@@ -323,6 +568,9 @@ class PDFService:
         Useful for email attachments and API responses.
         """
         pdf_bytes = self.generate_report(content)
+        if PYBASE64_AVAILABLE:
+            # SIMD encoder, straight to str without the intermediate bytes object
+            return b64encode_as_string(pdf_bytes)
         return base64.b64encode(pdf_bytes).decode('utf-8')
     
     def save_report(self, content: ReportContent, filepath: str = None) -> str:
@@ -337,184 +585,160 @@ class PDFService:
             Path to saved file
         """
         if not filepath:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"inventory_report_{content.material_code}_{timestamp}.pdf"
-            filepath = os.path.join(self.output_dir, filename)
-        
-        pdf_bytes = self.generate_report(content)
+            filepath = self._default_report_path(content)
         
         with open(filepath, 'wb') as f:
-            f.write(pdf_bytes)
+            self.generate_report_to(content, f)
         
         logger.info(f"Saved PDF report to: {filepath}")
         return filepath
     
-    def _build_header(self, content: ReportContent) -> list:
-        """Build document header"""
-        elements = []
+    def save_reports_batch(
+        self,
+        items: List[Tuple[ReportContent, Optional[str]]],
+        max_workers: int = None
+    ) -> List[str]:
+        """
+        Generate and save many PDF reports.
+        
+        Reports are rendered in worker processes (see generate_reports_batch)
+        and the finished files are written concurrently from a thread pool,
+        so slow storage (e.g. an NFS-backed output dir) overlaps across files.
+        
+        Args:
+            items: (content, filepath) pairs; a None filepath uses the default
+                name, suffixed with the warehouse code and item index
+            max_workers: Worker processes for rendering (default: CPU count)
+            
+        Returns:
+            Paths to the saved files, in the same order as items
+            
+        Raises:
+            ValueError: If two items would be written to the same path
+        """
+        if not items:
+            return []
+        
+        paths = [
+            filepath or self._default_report_path(content, f"{content.warehouse_code}_{i}")
+            for i, (content, filepath) in enumerate(items)
+        ]
+        # Concurrent O_TRUNC writes to one path would interleave two PDFs
+        if len(set(map(os.path.abspath, paths))) != len(paths):
+            raise ValueError("save_reports_batch: duplicate output paths in batch")
+        
+        documents = self.generate_reports_batch([content for content, _ in items], max_workers)
         
+        with ThreadPoolExecutor(max_workers=min(self.SAVE_WRITE_WORKERS, len(paths))) as pool:
+            list(pool.map(_write_file, paths, documents))
+        
+        logger.info(f"Saved {len(paths)} PDF reports")
+        return paths
+    
+    def _default_report_path(self, content: ReportContent, suffix: str = None) -> str:
+        """Build the timestamped output path for a report, creating the output dir once"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if suffix:
+            timestamp = f"{timestamp}_{suffix}"
+        filename = f"inventory_report_{content.material_code}_{timestamp}.pdf"
+        if not self._output_dir_ready:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._output_dir_ready = True
+        return os.path.join(self.output_dir, filename)
+    
+    def _build_header(self, content: ReportContent, out: list) -> None:
+        """Build document header"""
         # Title
-        elements.append(Paragraph(content.title, self.styles["title"]))
+        out.append(Paragraph(content.title, self.styles["title"]))
         
         # Subtitle
-        elements.append(Paragraph(content.subtitle, self.styles["subtitle"]))
+        out.append(Paragraph(content.subtitle, self.styles["subtitle"]))
         
         # Horizontal rule
-        elements.append(HRFlowable(
+        out.append(HRFlowable(
             width="100%",
             thickness=2,
             color=self.BRAND_PRIMARY,
             spaceBefore=5,
             spaceAfter=15
         ))
-        
-        return elements
     
-    def _build_alert_banner(self, content: ReportContent) -> list:
+    def _build_alert_banner(self, content: ReportContent, out: list) -> None:
         """Build severity alert banner"""
-        elements = []
-        
-        severity_text = {
-            "RED": "🔴 CRITICAL ALERT - Immediate Action Required",
-            "AMBER": "🟡 WARNING - Attention Needed",
-            "GREEN": "🟢 STATUS OK - All Systems Normal"
-        }
-        
-        style_map = {
-            "RED": self.styles["alert_red"],
-            "AMBER": self.styles["alert_amber"],
-            "GREEN": self.styles["alert_green"]
-        }
-        
-        banner_text = severity_text.get(content.severity, "INVENTORY ALERT")
-        banner_style = style_map.get(content.severity, self.styles["body"])
+        severity = content.severity
         
         # Create banner as a table for better styling
-        banner_data = [[Paragraph(banner_text, banner_style)]]
+        banner_data = [[Paragraph(
+            self._SEVERITY_BANNER_TEXT[severity],
+            self.styles[self._SEVERITY_BANNER_STYLE[severity]]
+        )]]
         banner_table = Table(banner_data, colWidths=["100%"])
-        banner_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), self.SEVERITY_COLORS.get(content.severity, colors.grey)),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white if content.severity != "AMBER" else colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('PADDING', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ]))
-        
-        elements.append(banner_table)
-        elements.append(Spacer(1, 20))
+        banner_table.setStyle(self._SEVERITY_BANNER_TABLE_STYLES[severity])
         
-        return elements
+        out.append(banner_table)
+        out.append(Spacer(1, 20))
     
-    def _build_info_section(self, content: ReportContent) -> list:
+    def _build_info_section(self, content: ReportContent, generated_at: datetime, out: list) -> None:
         """Build material and location information section"""
-        elements = []
+        out.append(Paragraph("📦 Material & Location", self.styles["heading"]))
         
-        elements.append(Paragraph("📦 Material & Location", self.styles["heading"]))
-        
-        # Two-column layout for info
+        # Two-column layout for info; only the free-text values need Paragraph wrapping
+        body = self.styles["body"]
         info_data = [
-            [
-                Paragraph("<b>Material:</b>", self.styles["body"]),
-                Paragraph(f"{content.material_name}", self.styles["body"]),
-                Paragraph("<b>Material Code:</b>", self.styles["body"]),
-                Paragraph(f"{content.material_code}", self.styles["body"])
-            ],
-            [
-                Paragraph("<b>Warehouse:</b>", self.styles["body"]),
-                Paragraph(f"{content.warehouse_name}", self.styles["body"]),
-                Paragraph("<b>Warehouse Code:</b>", self.styles["body"]),
-                Paragraph(f"{content.warehouse_code}", self.styles["body"])
-            ],
-            [
-                Paragraph("<b>Location:</b>", self.styles["body"]),
-                Paragraph(f"{content.location}", self.styles["body"]),
-                Paragraph("<b>Report Date:</b>", self.styles["body"]),
-                Paragraph(f"{(content.generated_at or get_ist_now()).strftime('%d %b %Y, %I:%M %p')} IST", self.styles["body"])
-            ]
+            ["Material:", Paragraph(content.material_name, body), "Material Code:", content.material_code],
+            ["Warehouse:", Paragraph(content.warehouse_name, body), "Warehouse\nCode:", content.warehouse_code],
+            ["Location:", Paragraph(content.location, body), "Report Date:", f"{generated_at.strftime('%d %b %Y, %I:%M %p')} IST"]
         ]
         
         info_table = Table(info_data, colWidths=[80, 140, 90, 140])
-        info_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ]))
-        
-        elements.append(info_table)
-        elements.append(Spacer(1, 15))
+        info_table.setStyle(self._INFO_TABLE_STYLE)
         
-        return elements
+        out.append(info_table)
+        out.append(Spacer(1, 15))
     
-    def _build_metrics_section(self, content: ReportContent) -> list:
+    def _build_metrics_section(self, content: ReportContent, out: list) -> None:
         """Build key metrics section with visual cards"""
-        elements = []
+        out.append(Paragraph("📊 Key Metrics", self.styles["heading"]))
         
-        elements.append(Paragraph("📊 Key Metrics", self.styles["heading"]))
+        # Determine UTR/OTR/PAR colors based on values
+        ratio_colors = self._RATIO_COLORS
+        utr_color = ratio_colors[bisect_left(self._RATIO_THRESHOLDS, content.utr)]
+        otr_color = ratio_colors[bisect_left(self._RATIO_THRESHOLDS, content.otr)]
+        par_color = ratio_colors[2 - bisect_right(self._PAR_THRESHOLDS, content.par)]
+        primary = self.BRAND_PRIMARY.hexval()
         
-        # Metrics cards
-        def create_metric_cell(label: str, value: str, color=None):
-            cell_color = color or self.BRAND_PRIMARY
-            return [
-                Paragraph(f"<font color='grey'>{label}</font>", self.styles["small"]),
-                Paragraph(f"<font color='{cell_color}'><b>{value}</b></font>", self.styles["metric_value"])
+        metrics_rows = [
+            [
+                ("Current Stock", f"{content.current_stock:,.0f} units", primary),
+                ("Reorder Point", f"{content.reorder_point:,.0f} units", primary),
+                ("Safety Stock", f"{content.safety_stock:,.0f} units", primary),
+                ("Max Level", f"{content.max_stock_level:,.0f} units", primary)
+            ],
+            [
+                ("UTR (Understock)", f"{content.utr:.1%}", utr_color),
+                ("OTR (Overstock)", f"{content.otr:.1%}", otr_color),
+                ("PAR (Adequacy)", f"{content.par:.1%}", par_color),
+                ("Days of Stock", f"{content.days_of_stock:.1f} days", primary)
             ]
-        
-        # Determine UTR/OTR colors based on values
-        utr_color = "#C62828" if content.utr > 0.5 else "#FFA000" if content.utr > 0.2 else "#2E7D32"
-        otr_color = "#C62828" if content.otr > 0.5 else "#FFA000" if content.otr > 0.2 else "#2E7D32"
-        par_color = "#C62828" if content.par < 0.3 else "#FFA000" if content.par < 0.6 else "#2E7D32"
-        
-        metrics_row1 = [
-            create_metric_cell("Current Stock", f"{content.current_stock:,.0f} units"),
-            create_metric_cell("Reorder Point", f"{content.reorder_point:,.0f} units"),
-            create_metric_cell("Safety Stock", f"{content.safety_stock:,.0f} units"),
-            create_metric_cell("Max Level", f"{content.max_stock_level:,.0f} units")
         ]
         
-        metrics_row2 = [
-            create_metric_cell("UTR (Understock)", f"{content.utr:.1%}", utr_color),
-            create_metric_cell("OTR (Overstock)", f"{content.otr:.1%}", otr_color),
-            create_metric_cell("PAR (Adequacy)", f"{content.par:.1%}", par_color),
-            create_metric_cell("Days of Stock", f"{content.days_of_stock:.1f} days")
+        # One Paragraph per card
+        body = self.styles["body"]
+        tmpl = self._METRIC_TMPL
+        metrics_display = [
+            [Paragraph(tmpl.format(label, color, value), body) for label, value, color in row]
+            for row in metrics_rows
         ]
         
-        # Flatten for table
-        metrics_data = [
-            [item for sublist in metrics_row1 for item in sublist],
-            [item for sublist in metrics_row2 for item in sublist]
-        ]
-        
-        # Restructure for proper display
-        metrics_display = []
-        for row in [metrics_row1, metrics_row2]:
-            display_row = []
-            for metric in row:
-                # Combine label and value in one cell
-                cell_content = f"{metric[0].text}<br/>{metric[1].text}"
-                display_row.append(Paragraph(cell_content, self.styles["body"]))
-            metrics_display.append(display_row)
-        
         metrics_table = Table(metrics_display, colWidths=[112, 112, 112, 112])
-        metrics_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor("#F5F5F5")),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor("#E0E0E0")),
-            ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E0E0E0")),
-            ('PADDING', (0, 0), (-1, -1), 10),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        metrics_table.setStyle(self._METRICS_TABLE_STYLE)
         
-        elements.append(metrics_table)
-        elements.append(Spacer(1, 15))
-        
-        return elements
+        out.append(metrics_table)
+        out.append(Spacer(1, 15))
     
-    def _build_stock_status(self, content: ReportContent) -> list:
+    def _build_stock_status(self, content: ReportContent, out: list) -> None:
         """Build stock status comparison"""
-        elements = []
-        
-        elements.append(Paragraph("📈 Stock Status", self.styles["heading"]))
+        out.append(Paragraph("📈 Stock Status", self.styles["heading"]))
         
         gap = content.optimal_stock - content.current_stock
         gap_pct = (gap / content.optimal_stock * 100) if content.optimal_stock > 0 else 0
@@ -533,108 +757,98 @@ class PDFService:
         ]
         
         status_table = Table(status_data, colWidths=[112, 112, 112, 112])
-        status_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.BRAND_PRIMARY),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('PADDING', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (3, 1), (3, 1), status_color),
-            ('TEXTCOLOR', (3, 1), (3, 1), colors.white),
-            ('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold'),
-            ('BOX', (0, 0), (-1, -1), 1, self.BRAND_PRIMARY),
-            ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E0E0E0")),
-        ]))
-        
-        elements.append(status_table)
-        elements.append(Spacer(1, 15))
+        status_table.setStyle(self._STATUS_TABLE_STYLE)
+        status_table.setStyle([('BACKGROUND', (3, 1), (3, 1), status_color)])
         
-        return elements
+        out.append(status_table)
+        out.append(Spacer(1, 15))
     
-    def _build_analysis_section(self, content: ReportContent) -> list:
+    def _build_analysis_section(self, content: ReportContent, out: list) -> None:
         """Build summary and recommendations section"""
-        elements = []
-        
         # Summary
-        elements.append(Paragraph("📝 Summary", self.styles["heading"]))
-        elements.append(Paragraph(content.summary, self.styles["body"]))
-        elements.append(Spacer(1, 10))
+        out.append(Paragraph("📝 Summary", self.styles["heading"]))
+        out.append(Paragraph(content.summary, self.styles["body"]))
+        out.append(Spacer(1, 10))
         
         # Detailed analysis if available
         if content.detailed_analysis:
-            elements.append(Paragraph("🔍 Detailed Analysis", self.styles["subheading"]))
-            elements.append(Paragraph(content.detailed_analysis, self.styles["body"]))
-            elements.append(Spacer(1, 10))
+            out.append(Paragraph("🔍 Detailed Analysis", self.styles["subheading"]))
+            out.append(Paragraph(content.detailed_analysis, self.styles["body"]))
+            out.append(Spacer(1, 10))
         
         # Recommendations
         if content.recommendations:
-            elements.append(Paragraph("✅ Recommended Actions", self.styles["heading"]))
+            out.append(Paragraph("✅ Recommended Actions", self.styles["heading"]))
             
             for i, rec in enumerate(content.recommendations, 1):
-                elements.append(Paragraph(
+                out.append(Paragraph(
                     f"<b>{i}.</b> {rec}",
                     self.styles["body"]
                 ))
             
-            elements.append(Spacer(1, 10))
-        
-        return elements
+            out.append(Spacer(1, 10))
     
-    def _build_history_section(self, content: ReportContent) -> list:
+    def _build_history_section(self, content: ReportContent, out: list) -> None:
         """Build transaction history section"""
-        elements = []
-        
         if not content.history:
-            return elements
+            return
         
-        elements.append(Paragraph("📜 Recent Transaction History", self.styles["heading"]))
+        out.append(Paragraph("📜 Recent Transaction History", self.styles["heading"]))
         
         # History table
-        history_header = ["Date", "Type", "Quantity", "Remarks"]
-        history_data = [history_header]
-        
-        for h in content.history[:10]:  # Last 10 transactions
-            date_str = h.get("date", "N/A")
-            if date_str and date_str != "N/A":
-                try:
-                    dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                    date_str = dt.strftime("%d %b %Y")
-                except:
-                    pass
-            
-            history_data.append([
-                date_str,
-                h.get("type", "N/A"),
-                f"{h.get('quantity', 0):,.0f}",
-                (h.get("remarks", "")[:40] + "...") if len(h.get("remarks", "")) > 40 else h.get("remarks", "")
-            ])
+        history_data = [self._HISTORY_HEADER]
+        
+        if isinstance(content.history, Mapping):
+            history_data.extend(self._history_rows_from_columns(content.history, self.HISTORY_MAX_ROWS))
+        else:
+            for h in content.history[:self.HISTORY_MAX_ROWS]:
+                get = h.get
+                history_data.append((
+                    _format_history_date(get("date", "N/A")),
+                    get("type", "N/A"),
+                    f"{get('quantity', 0):,.0f}",
+                    _truncate_remarks(get("remarks"))
+                ))
         
         history_table = Table(history_data, colWidths=[80, 80, 80, 200])
-        history_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.BRAND_PRIMARY),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('ALIGN', (2, 1), (2, -1), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('PADDING', (0, 0), (-1, -1), 6),
-            ('BOX', (0, 0), (-1, -1), 1, self.BRAND_PRIMARY),
-            ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E0E0E0")),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F8F8F8")])
-        ]))
+        history_table.setStyle(self._HISTORY_TABLE_STYLE)
+        
+        out.append(history_table)
+        out.append(Spacer(1, 15))
+    
+    @staticmethod
+    def _history_rows_from_columns(columns: Mapping[str, Sequence], limit: int) -> list:
+        """
+        Build history table rows from column sequences.
         
-        elements.append(history_table)
-        elements.append(Spacer(1, 15))
+        Each column is formatted in a single pass rather than looking up
+        every field of every row dict. Missing columns fall back to the
+        same defaults as the row-dict layout.
         
-        return elements
+        Args:
+            columns: Sequences keyed by "date", "type", "quantity" and "remarks"
+            limit: Maximum number of rows
+            
+        Returns:
+            Row tuples of (date, type, quantity, remarks) strings
+        """
+        lengths = [len(columns[key]) for key in ("date", "type", "quantity", "remarks") if key in columns]
+        n = min(lengths + [limit]) if lengths else 0
+        
+        def column(key, default):
+            values = columns.get(key)
+            return [default] * n if values is None else values[:n]
+        
+        return list(zip(
+            map(_format_history_date, column("date", "N/A")),
+            column("type", "N/A"),
+            map("{:,.0f}".format, column("quantity", 0)),
+            map(_truncate_remarks, column("remarks", ""))
+        ))
     
-    def _build_footer(self, content: ReportContent) -> list:
+    def _build_footer(self, content: ReportContent, generated_at: datetime, out: list) -> None:
         """Build document footer"""
-        elements = []
-        
-        elements.append(HRFlowable(
+        out.append(HRFlowable(
             width="100%",
             thickness=1,
             color=colors.grey,
@@ -642,20 +856,15 @@ class PDFService:
             spaceAfter=10
         ))
         
-        footer_text = f"""
-        <font size="8" color="grey">
-        This report was automatically generated by NEXUS Inventory Management System.<br/>
-        Report ID: {content.report_id or 'N/A'}<br/>
-        Generated: {(content.generated_at or datetime.now()).strftime('%Y-%m-%d %H:%M:%S UTC')}<br/>
-        <br/>
-        POWERGRID Corporation of India Limited<br/>
-        For queries, contact: inventory-support@powergrid.in
-        </font>
-        """
+        if not content.include_footer:
+            return
         
-        elements.append(Paragraph(footer_text, self.styles["small"]))
+        footer_text = self._FOOTER_TEMPLATE.substitute(
+            report_id=content.report_id or 'N/A',
+            generated=generated_at.strftime('%Y-%m-%d %H:%M:%S IST')
+        )
         
-        return elements
+        out.append(Paragraph(footer_text, self.styles["small"]))
     
     def _generate_fallback_report(self, content: ReportContent) -> bytes:
         """Generate simple text-based report if ReportLab not available"""
@@ -666,7 +875,7 @@ NEXUS INVENTORY ALERT REPORT
 {content.title}
 {content.subtitle}
 
-SEVERITY: {content.severity}
+SEVERITY: {content.severity_label}
 ALERT TYPE: {content.alert_type.upper()}
 
 MATERIAL INFORMATION
@@ -709,6 +918,28 @@ NEXUS Inventory Management System - POWERGRID India
         return report_text.encode('utf-8')
 
 
+_pdf_service: Optional[PDFService] = None
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Write data to path with raw fd writes (thread-pool worker for save_reports_batch)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _render_report(content: ReportContent) -> bytes:
+    """Process-pool worker for PDFService.generate_reports_batch"""
+    return get_pdf_service().generate_report(content)
+
+
 def get_pdf_service() -> PDFService:
-    """Get a configured PDF service instance"""
-    return PDFService()
+    """Get the shared PDF service instance"""
+    global _pdf_service
+    if _pdf_service is None:
+        _pdf_service = PDFService()
+    return _pdf_service
@@ -143,3 +143,28 @@ def estimate_delivery_time(distance_km: float,
     buffer_days = 2
     
     return base_lead_time_days + travel_days + buffer_days
+
+
+def geohash_cell(latitude: float, longitude: float, precision: int = 5) -> Tuple[int, int]:
+    """
+    Grid indices of the geohash cell containing a point
+    
+    The world is split into the same grid as a geohash of the given
+    precision (5 bits per character, alternating longitude and latitude),
+    and the point's row and column are returned as integers - a cheap,
+    hashable key for caching by area.
+    
+    Args:
+        latitude, longitude: Point coordinates (in degrees)
+        precision: Geohash precision (characters; 5 ~ 4.9km x 4.9km cell)
+    
+    Returns:
+        Tuple of (latitude_index, longitude_index)
+    """
+    lon_bits = (precision * 5 + 1) // 2
+    lat_bits = precision * 5 // 2
+    
+    lat_idx = int((latitude + 90.0) / 180.0 * (1 << lat_bits))
+    lon_idx = int((longitude + 180.0) / 360.0 * (1 << lon_bits))
+    
+    return min(lat_idx, (1 << lat_bits) - 1), min(lon_idx, (1 << lon_bits) - 1)